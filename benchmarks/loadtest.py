@@ -0,0 +1,344 @@
+"""
+Load test DaikinApiClient and the coordinator against simulated devices.
+
+Starts benchmarks/simulator.py in a subprocess (or uses one already running
+with --external), then refreshes every device for --duration seconds and
+reports throughput, p50/p99 refresh latency, CPU time per refresh and
+event-loop lag. --transport picks the HTTP client under comparison.
+--replay plays traffic captured by the integration back instead, one
+device per captured unit, at --speed times the captured response times.
+
+Usage: python benchmarks/loadtest.py --devices 100 --mode coordinator
+       python benchmarks/loadtest.py --devices 100 --transport raw
+       python benchmarks/loadtest.py --replay capture.jsonl --speed 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components"))
+
+from daikin_humidifier.api import DaikinApiClient, DaikinApiClientError
+from daikin_humidifier.const import (
+    DOMAIN,
+    LOGGER,
+    TRANSPORT_AIOHTTP,
+    TRANSPORT_RAW,
+)
+from daikin_humidifier.coordinator import DaikinDataUpdateCoordinator
+from daikin_humidifier.data import DaikinData
+from daikin_humidifier.recording import (
+    ReplayTransport,
+    read_capture,
+    replay_transports,
+)
+from daikin_humidifier.scheduler import DaikinRequestScheduler
+from homeassistant.config_entries import ConfigEntry, current_entry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from simulator import add_fault_arguments
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+SIMULATOR = Path(__file__).with_name("simulator.py")
+
+
+@dataclass
+class LoadResult:
+    """Summary of one load test run."""
+
+    mode: str
+    transport: str
+    devices: int
+    duration: float
+    refreshes: int
+    errors: int
+    refreshes_per_second: float
+    requests_per_second: float
+    latency_p50_ms: float
+    latency_p99_ms: float
+    cpu_ms_per_refresh: float
+    loop_lag_p50_ms: float
+    loop_lag_p99_ms: float
+    loop_lag_max_ms: float
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """Return the value below which the given fraction of values fall."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@contextlib.asynccontextmanager
+async def simulated_fleet(
+    devices: int, port: int, fault_args: list[str]
+) -> AsyncIterator[list[str]]:
+    """Run the simulator in a subprocess and yield the device hosts."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(SIMULATOR),
+        f"--devices={devices}",
+        f"--port={port}",
+        *fault_args,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    try:
+        line = await process.stdout.readline()
+        if not line.startswith(b"ready"):
+            msg = "Simulator did not start"
+            raise RuntimeError(msg)
+        yield [f"127.0.0.1:{port + index}" for index in range(devices)]
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+async def _monitor_loop_lag(lags: list[float], period: float = 0.01) -> None:
+    """Record how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(period)
+        lags.append(loop.time() - start - period)
+
+
+def _client_refresh(client: DaikinApiClient) -> Callable[[], Awaitable[bool]]:
+    """Build a refresh that fetches the three polled endpoints directly."""
+
+    async def _refresh() -> bool:
+        try:
+            await asyncio.gather(
+                client.async_get_control_info(),
+                client.async_get_sensor_info(),
+                client.async_get_unit_status(),
+            )
+        except DaikinApiClientError:
+            return False
+        return True
+
+    return _refresh
+
+
+def build_coordinator(
+    hass: HomeAssistant, host: str, client: DaikinApiClient
+) -> DaikinDataUpdateCoordinator:
+    """Build a coordinator and config entry outside of a running setup."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=host,
+        data={CONF_HOST: host},
+        source="user",
+        options={},
+        unique_id=host,
+        discovery_keys={},
+    )
+    current_entry.set(entry)
+    coordinator = DaikinDataUpdateCoordinator(
+        hass,
+        LOGGER,
+        name=DOMAIN,
+        # Every block is due on every refresh
+        intervals=dict.fromkeys(("control", "sensors", "status"), timedelta(0)),
+    )
+    entry.runtime_data = DaikinData(
+        client=client,
+        coordinator=coordinator,
+        integration=None,  # not loaded through Home Assistant
+    )
+    return coordinator
+
+
+def _coordinator_refresh(
+    hass: HomeAssistant, host: str, client: DaikinApiClient
+) -> Callable[[], Awaitable[bool]]:
+    """Build a refresh that runs a full coordinator update cycle."""
+    coordinator = build_coordinator(hass, host, client)
+
+    async def _refresh() -> bool:
+        await coordinator.async_refresh()
+        return coordinator.last_update_success
+
+    return _refresh
+
+
+async def run_load(  # noqa: PLR0913
+    hosts: list[str],
+    *,
+    mode: str,
+    duration: float,
+    interval: float = 0.0,
+    max_in_flight: int = 0,
+    transport: str = TRANSPORT_AIOHTTP,
+    replay: dict[str, ReplayTransport] | None = None,
+) -> LoadResult:
+    """
+    Refresh every host back to back (or every interval) for duration.
+
+    With replay, the clients are answered by the replay transport of their
+    host instead of over the network.
+    """
+    connector = aiohttp.TCPConnector(limit=4096, limit_per_host=100)
+    limiter = DaikinRequestScheduler(max_in_flight) if max_in_flight else None
+    latencies: list[float] = []
+    lags: list[float] = []
+    errors = 0
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        hass = HomeAssistant(tempfile.gettempdir()) if mode == "coordinator" else None
+        refreshes = []
+        clients = []
+        for host in hosts:
+            client = DaikinApiClient(
+                host=host, session=session, limiter=limiter, transport=transport
+            )
+            if replay is not None:
+                client.set_replay(replay[host])
+            clients.append(client)
+            refreshes.append(
+                _client_refresh(client)
+                if hass is None
+                else _coordinator_refresh(hass, host, client)
+            )
+
+        async def _device(refresh: Callable[[], Awaitable[bool]]) -> None:
+            nonlocal errors
+            loop = asyncio.get_running_loop()
+            while True:
+                start = loop.time()
+                if not await refresh():
+                    errors += 1
+                latencies.append(loop.time() - start)
+                if interval:
+                    await asyncio.sleep(max(0, interval - (loop.time() - start)))
+
+        monitor = asyncio.create_task(_monitor_loop_lag(lags))
+        tasks = [asyncio.create_task(_device(refresh)) for refresh in refreshes]
+        started = time.perf_counter()
+        # The simulator runs in another process, so this is the client's CPU
+        cpu_started = time.process_time()
+        await asyncio.sleep(duration)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+        for task in (*tasks, monitor):
+            task.cancel()
+        await asyncio.gather(*tasks, monitor, return_exceptions=True)
+        for client in clients:
+            client.close()
+        if hass is not None:
+            await hass.async_stop(force=True)
+
+    return LoadResult(
+        mode=mode,
+        transport=clients[0].transport_name if clients else transport,
+        devices=len(hosts),
+        duration=round(elapsed, 3),
+        refreshes=len(latencies),
+        errors=errors,
+        refreshes_per_second=round(len(latencies) / elapsed, 1),
+        requests_per_second=round(3 * len(latencies) / elapsed, 1),
+        latency_p50_ms=round(_percentile(latencies, 0.50) * 1000, 2),
+        latency_p99_ms=round(_percentile(latencies, 0.99) * 1000, 2),
+        cpu_ms_per_refresh=round(cpu * 1000 / max(1, len(latencies)), 3),
+        loop_lag_p50_ms=round(_percentile(lags, 0.50) * 1000, 2),
+        loop_lag_p99_ms=round(_percentile(lags, 0.99) * 1000, 2),
+        loop_lag_max_ms=round(max(lags, default=0.0) * 1000, 2),
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """Run the load test described by the command line."""
+    fault_args = [
+        f"--{name.replace('_', '-')}={getattr(args, name)}"
+        for name in (
+            "latency",
+            "jitter",
+            "loss",
+            "timeout",
+            "auth_error",
+            "server_error",
+        )
+    ]
+    replay = None
+    if args.replay:
+        replay = replay_transports(read_capture(args.replay), args.speed)
+        context = contextlib.nullcontext(list(replay))
+    elif args.external:
+        hosts = [f"127.0.0.1:{args.port + index}" for index in range(args.devices)]
+        context = contextlib.nullcontext(hosts)
+    else:
+        context = simulated_fleet(args.devices, args.port, fault_args)
+
+    async with context as hosts:
+        result = await run_load(
+            hosts,
+            mode=args.mode,
+            duration=args.duration,
+            interval=args.interval,
+            max_in_flight=args.max_in_flight,
+            transport=args.transport,
+            replay=replay,
+        )
+
+    if args.json:
+        print(json.dumps(asdict(result)))
+        return
+    for key, value in asdict(result).items():
+        print(f"{key:>22}: {value}")
+
+
+def main() -> None:
+    """Parse the command line and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, default=10, help="1-500")
+    parser.add_argument("--port", type=int, default=18000, help="first port")
+    parser.add_argument("--external", action="store_true", help="simulator running")
+    parser.add_argument("--mode", choices=("client", "coordinator"), default="client")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument(
+        "--transport",
+        choices=(TRANSPORT_AIOHTTP, TRANSPORT_RAW),
+        default=TRANSPORT_AIOHTTP,
+        help="HTTP client of DaikinApiClient",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.0, help="seconds, 0 = back to back"
+    )
+    parser.add_argument(
+        "--max-in-flight", type=int, default=0, help="fleet cap, 0 = none"
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        nargs="+",
+        metavar="CAPTURE",
+        help="captured traffic to play back, backups included (.gz)",
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="replay speed, 0 = no delays"
+    )
+    parser.add_argument("--json", action="store_true", help="one JSON line")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Local stand-in for Daikin humidifier units.
+
+Serves /common/basic_info and the /cleaner/* endpoints in the device's
+key=value format, one aiohttp site per virtual device on consecutive ports
+of 127.0.0.1. Latency, dropped connections, hung requests and 401/5xx
+answers can be injected to reproduce slow or flaky units.
+
+Usage: python benchmarks/simulator.py --devices 50 --latency 0.05 --loss 0.01
+
+A device is reached as host "127.0.0.1:<port>", exactly like a real unit's
+IP address in the config entry.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import random
+from dataclasses import dataclass
+from urllib.parse import quote
+
+from aiohttp import web
+
+CONTROL_KEYS = ("pow", "mode", "humd", "airvol")
+
+
+@dataclass(frozen=True, kw_only=True)
+class Faults:
+    """Fault injection settings shared by the simulated devices."""
+
+    # Mean response delay and uniform jitter around it, in seconds
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Probability of dropping the connection without an answer
+    loss: float = 0.0
+    # Probability of never answering, so the client hits its timeout
+    timeout: float = 0.0
+    # Probability of answering with 401 or 500
+    auth_error: float = 0.0
+    server_error: float = 0.0
+
+
+class VirtualDevice:
+    """One simulated unit with its own control and sensor state."""
+
+    def __init__(self, index: int, faults: Faults, model: str = "MCK55W") -> None:
+        """Initialize the device with plausible readings."""
+        self.index = index
+        self.faults = faults
+        self.model = model
+        self.name = f"Simulated {index}"
+        self.mac = f"0200{index:08X}"
+        self.control = {"pow": "1", "mode": "1", "humd": "2", "airvol": "0"}
+        self.pm25 = random.randint(3, 30)
+        self.hhum = random.randint(35, 60)
+        self.htemp = round(random.uniform(18, 26), 1)
+        self.filter_sign = "0"
+        self.requests = 0
+
+    def _drift(self) -> None:
+        """Let the sensor readings wander a little between polls."""
+        self.pm25 = max(0, self.pm25 + random.choice((-1, 0, 0, 1)))
+        self.hhum = min(90, max(10, self.hhum + random.choice((-1, 0, 0, 1))))
+        self.htemp = round(self.htemp + random.choice((-0.1, 0, 0, 0.1)), 1)
+
+    def body(self, path: str, query: dict[str, str]) -> str | None:
+        """Return the key=value body for an endpoint, None if unknown."""
+        if path == "/common/basic_info":
+            pairs = {
+                "type": "C",
+                "reg": "jp",
+                "ver": "1_2_3",
+                "name": quote(self.name),
+                "mac": self.mac,
+            }
+        elif path == "/cleaner/get_model_info":
+            pairs = {"model": self.model}
+        elif path == "/cleaner/get_control_info":
+            pairs = self.control
+        elif path == "/cleaner/set_control_info":
+            self.control.update(
+                {key: value for key, value in query.items() if key in CONTROL_KEYS}
+            )
+            pairs = {}
+        elif path == "/cleaner/get_sensor_info":
+            self._drift()
+            pairs = {"htemp": self.htemp, "hhum": self.hhum, "pm25": self.pm25}
+        elif path == "/cleaner/get_unit_status":
+            pairs = {"filter_sign": self.filter_sign}
+        else:
+            return None
+        return ",".join(["ret=OK", *(f"{key}={value}" for key, value in pairs.items())])
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """Answer a request, applying the configured faults."""
+        self.requests += 1
+        faults = self.faults
+        roll = random.random()
+        if faults.latency or faults.jitter:
+            await asyncio.sleep(
+                max(0, faults.latency + random.uniform(-1, 1) * faults.jitter)
+            )
+
+        if roll < faults.loss:
+            if request.transport is not None:
+                request.transport.abort()
+            raise web.HTTPServiceUnavailable
+        roll -= faults.loss
+        if roll < faults.timeout:
+            await asyncio.sleep(3600)
+        roll -= faults.timeout
+        if roll < faults.auth_error:
+            raise web.HTTPUnauthorized
+        roll -= faults.auth_error
+        if roll < faults.server_error:
+            raise web.HTTPInternalServerError
+
+        body = self.body(request.path, dict(request.query))
+        if body is None:
+            raise web.HTTPNotFound
+        return web.Response(text=body)
+
+
+async def async_start_fleet(
+    count: int,
+    base_port: int,
+    faults: Faults,
+) -> tuple[list[VirtualDevice], list[web.AppRunner]]:
+    """Start count devices on consecutive ports from base_port."""
+    devices = []
+    runners = []
+    for index in range(count):
+        device = VirtualDevice(index, faults)
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", device.handle)
+        runner = web.AppRunner(app, access_log=None, handle_signals=False)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", base_port + index).start()
+        devices.append(device)
+        runners.append(runner)
+    return devices, runners
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the fault injection options to a command line parser."""
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability")
+    parser.add_argument("--timeout", type=float, default=0.0, help="probability")
+    parser.add_argument("--auth-error", type=float, default=0.0, help="probability")
+    parser.add_argument("--server-error", type=float, default=0.0, help="probability")
+
+
+def faults_from_arguments(args: argparse.Namespace) -> Faults:
+    """Build the fault settings from parsed command line options."""
+    return Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        loss=args.loss,
+        timeout=args.timeout,
+        auth_error=args.auth_error,
+        server_error=args.server_error,
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run the simulated fleet until interrupted."""
+    _, runners = await async_start_fleet(
+        args.devices, args.port, faults_from_arguments(args)
+    )
+    # Harnesses wait for this line before they start polling
+    print(f"ready {args.devices} devices on 127.0.0.1:{args.port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main() -> None:
+    """Parse the command line and serve the simulated devices."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--port", type=int, default=18000, help="first port")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Compare parse-and-read cost of the raw response dicts and DaikinDeviceState.
+
+Each round parses one refresh worth of responses and then evaluates every
+entity state property READS times. Home Assistant reads the properties at
+least once per state write, more often when attributes or templates use them.
+
+Usage: python benchmarks/state_model.py [--rounds N] [--reads N ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components"))
+
+from daikin_humidifier.api import _parse_response
+from daikin_humidifier.const import (
+    FAN_AUTO,
+    FAN_SPEEDS,
+    HUMIDITY_HIGH,
+    HUMIDITY_LOW,
+    HUMIDITY_MODES,
+    HUMIDITY_NORMAL,
+    HUMIDITY_OFF,
+    HUMIDITY_TARGETS,
+    MODES,
+    POWER_ON,
+)
+from daikin_humidifier.data import DaikinDeviceState
+from daikin_humidifier.fan import ORDERED_NAMED_FAN_SPEEDS
+
+CONTROL = "ret=OK,pow=1,mode=1,airvol=3,humd=2,ion=1,redirect_id=0,tmr_on=0"
+SENSORS = "ret=OK,htemp=22.5,hhum=45,pm25=12,dust=1,odor=2,err=0"
+STATUS = "ret=OK,filter_sign=0,water_supply=0,err=0,pm25_alert=0"
+
+
+def _read_dicts(data: dict[str, dict[str, str]]) -> tuple:
+    """Evaluate every entity property the way the dict-based entities did."""
+    control = data.get("control", {})
+    sensors = data.get("sensors", {})
+    status = data.get("status", {})
+
+    humidity_map = {
+        HUMIDITY_OFF: 0,
+        HUMIDITY_LOW: 40,
+        HUMIDITY_NORMAL: 50,
+        HUMIDITY_HIGH: 60,
+    }
+    fan_value = data.get("control", {}).get("airvol")
+    fan_mode = FAN_SPEEDS.get(fan_value)
+    values = []
+    for key in ("pm25", "hhum", "htemp"):
+        value = data.get("sensors", {}).get(key)
+        values.append(float(value) if key == "htemp" else int(value))
+    return (
+        control.get("pow") == POWER_ON,
+        MODES.get(data.get("control", {}).get("mode")),
+        humidity_map.get(data.get("control", {}).get("humd"), 50),
+        int(sensors.get("hhum")),
+        data.get("control", {}).get("pow") == POWER_ON,
+        fan_mode in ORDERED_NAMED_FAN_SPEEDS,
+        data.get("control", {}).get("airvol") == FAN_AUTO,
+        HUMIDITY_MODES.get(data.get("control", {}).get("humd")),
+        *values,
+        status.get("filter_sign") == "1",
+    )
+
+
+def _read_state(state: DaikinDeviceState) -> tuple:
+    """Evaluate every entity property from the decoded snapshot."""
+    return (
+        state.power is True,
+        MODES.get(state.mode),
+        HUMIDITY_TARGETS.get(state.humidity_level, 50),
+        state.hhum,
+        state.power is True,
+        FAN_SPEEDS.get(state.fan_speed) in ORDERED_NAMED_FAN_SPEEDS,
+        state.fan_speed == FAN_AUTO,
+        HUMIDITY_MODES.get(state.humidity_level),
+        state.pm25,
+        state.hhum,
+        state.htemp,
+        state.filter_sign is True,
+    )
+
+
+def _dict_round(reads: int) -> None:
+    data = {
+        "control": _parse_response(CONTROL),
+        "sensors": _parse_response(SENSORS),
+        "status": _parse_response(STATUS),
+    }
+    for _ in range(reads):
+        _read_dicts(data)
+
+
+def _state_round(reads: int) -> None:
+    state = DaikinDeviceState.from_blocks(
+        _parse_response(CONTROL),
+        _parse_response(SENSORS),
+        _parse_response(STATUS),
+    )
+    for _ in range(reads):
+        _read_state(state)
+
+
+def main() -> None:
+    """Run the benchmark and print per-round timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=50_000)
+    parser.add_argument("--reads", type=int, nargs="+", default=[1, 2, 5])
+    args = parser.parse_args()
+
+    print(f"{'reads':>5} {'dicts us':>9} {'state us':>9} {'speedup':>8}")
+    for reads in args.reads:
+        timings = [
+            min(
+                timeit.repeat(
+                    lambda f=func, n=reads: f(n), number=args.rounds, repeat=7
+                )
+            )
+            / args.rounds
+            * 1e6
+            for func in (_dict_round, _state_round)
+        ]
+        print(
+            f"{reads:>5} {timings[0]:>9.2f} {timings[1]:>9.2f}"
+            f" {timings[0] / timings[1]:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
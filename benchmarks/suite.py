@@ -0,0 +1,328 @@
+"""
+Benchmark the integration's hot paths and check them against a baseline.
+
+Measures response parsing, DaikinApiClient request overhead, full
+coordinator update cycles at 1, 10 and 100 simulated devices, and the state
+calculation of every entity of a device. Results are written as JSON; with
+--check they are compared with the baseline and the run fails when a
+throughput drops, or a latency grows, by more than --threshold.
+
+Timings depend on the machine, so no baseline is committed: record one
+with --update on the machine that runs --check. It is kept out of git,
+and --check refuses a baseline taken on another host, Python version or
+transport (--transport raw runs the client benchmarks on the lightweight
+client instead of aiohttp).
+
+Usage: python benchmarks/suite.py [--check | --update] [--threshold 0.25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components"))
+
+from daikin_humidifier.api import DaikinApiClient, _parse_response
+from daikin_humidifier.binary_sensor import (
+    ENTITY_DESCRIPTIONS as BINARY_SENSOR_DESCRIPTIONS,
+)
+from daikin_humidifier.binary_sensor import DaikinBinarySensor
+from daikin_humidifier.const import TRANSPORT_AIOHTTP, TRANSPORT_RAW
+from daikin_humidifier.data import DaikinDeviceState
+from daikin_humidifier.fan import DaikinFan
+from daikin_humidifier.humidifier import DaikinHumidifier
+from daikin_humidifier.select import DaikinHumidityModeSelect
+from daikin_humidifier.sensor import (
+    ENTITY_DESCRIPTIONS,
+    DaikinAverageSensor,
+    DaikinSensor,
+    DaikinTrendSensor,
+    _history_descriptions,
+)
+from homeassistant.core import HomeAssistant
+from loadtest import build_coordinator, run_load, simulated_fleet
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.entity import Entity
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# Report entries that must match the baseline's for timings to be comparable
+RUN_CONDITIONS = ("host", "python", "machine", "transport")
+DEVICE_COUNTS = (1, 10, 100)
+
+# Latency changes smaller than this are scheduling noise, whatever the ratio
+LATENCY_NOISE_MS = 1.0
+
+# Timing runs of the CPU-bound benchmarks; the fastest one is kept
+REPEAT = 9
+
+# Bodies as sent by an MCK55W
+PAYLOADS = {
+    "basic_info": (
+        "ret=OK,type=C,reg=jp,dst=1,ver=1_14_68,rev=1C0C0A6,pow=1,err=0,"
+        "location=0,name=%e5%af%9d%e5%ae%a4,icon=0,method=polling,port=30050,"
+        "id=,pw=,lpw_flag=0,adp_kind=3,pv=0,cpv=0,cpv_minor=00,led=1,"
+        "en_setzone=0,mac=C0E434E5A1B2,adp_mode=run,en_hol=0,grp_name=,en_grp=0"
+    ),
+    "control": "ret=OK,pow=1,mode=1,airvol=3,humd=2,ion=1,redirect_id=0,tmr_on=0",
+    "sensors": "ret=OK,htemp=22.5,hhum=45,pm25=12,dust=1,odor=2,err=0",
+    "status": "ret=OK,filter_sign=0,water_supply=0,err=0,pm25_alert=0",
+}
+
+
+def _ms(seconds: float) -> float:
+    """Return seconds as rounded milliseconds."""
+    return round(seconds * 1000, 3)
+
+
+def bench_parse(rounds: int) -> dict[str, float]:
+    """Parse every payload rounds times."""
+    payloads = list(PAYLOADS.values())
+
+    def _parse_all() -> None:
+        for payload in payloads:
+            _parse_response(payload)
+
+    elapsed = min(timeit.repeat(_parse_all, number=rounds, repeat=REPEAT))
+    return {"parses_per_second": round(rounds * len(payloads) / elapsed)}
+
+
+async def bench_client(host: str, duration: float, transport: str) -> dict[str, float]:
+    """Send requests to one device back to back, one at a time."""
+    latencies = []
+    async with aiohttp.ClientSession() as session:
+        client = DaikinApiClient(host=host, session=session, transport=transport)
+        await client.async_get_control_info()  # open the connection
+        end = time.perf_counter() + duration
+        while (start := time.perf_counter()) < end:
+            await client.async_get_control_info()
+            latencies.append(time.perf_counter() - start)
+        client.close()
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests_per_second": round(len(latencies) / duration, 1),
+        "latency_p50_ms": _ms(quantiles[49]),
+        "latency_p99_ms": _ms(quantiles[98]),
+    }
+
+
+async def bench_update_cycles(
+    hosts: list[str], duration: float, transport: str
+) -> dict[str, float]:
+    """Run full coordinator update cycles on every host back to back."""
+    result = await run_load(
+        hosts, mode="coordinator", duration=duration, transport=transport
+    )
+    return {
+        "refreshes_per_second": result.refreshes_per_second,
+        "latency_p50_ms": result.latency_p50_ms,
+        "latency_p99_ms": result.latency_p99_ms,
+        "cpu_ms_per_refresh": result.cpu_ms_per_refresh,
+        "errors": result.errors,
+    }
+
+
+async def bench_entities(host: str, rounds: int) -> dict[str, float]:
+    """Calculate the state and attributes of every entity of a device."""
+    hass = HomeAssistant(tempfile.gettempdir())
+    async with aiohttp.ClientSession() as session:
+        client = DaikinApiClient(host=host, session=session)
+        coordinator = build_coordinator(hass, host, client)
+        await coordinator.async_refresh()
+    # Fixed values, so every run formats the same states
+    coordinator.data = DaikinDeviceState.from_blocks(
+        *(_parse_response(PAYLOADS[key]) for key in ("control", "sensors", "status"))
+    )
+
+    entities: list[tuple[str, Entity]] = [
+        ("humidifier", DaikinHumidifier(coordinator)),
+        ("fan", DaikinFan(coordinator)),
+        ("select", DaikinHumidityModeSelect(coordinator)),
+        *(
+            ("binary_sensor", DaikinBinarySensor(coordinator, description))
+            for description in BINARY_SENSOR_DESCRIPTIONS
+        ),
+    ]
+    for description in ENTITY_DESCRIPTIONS:
+        average, trend = _history_descriptions(description)
+        entities.extend(
+            (
+                ("sensor", DaikinSensor(coordinator, description)),
+                ("sensor", DaikinAverageSensor(coordinator, average, description.key)),
+                ("sensor", DaikinTrendSensor(coordinator, trend, description.key)),
+            )
+        )
+    for index, (domain, entity) in enumerate(entities):
+        entity.hass = hass
+        entity.entity_id = f"{domain}.benchmark_{index}"
+
+    # What Home Assistant evaluates on every state write, short of the name
+    # and registry lookups that need a loaded platform
+    def _calculate_all() -> None:
+        for _, entity in entities:
+            _ = (
+                entity.available,
+                entity.state,
+                entity.capability_attributes,
+                entity.state_attributes,
+                entity.extra_state_attributes,
+            )
+
+    elapsed = min(timeit.repeat(_calculate_all, number=rounds, repeat=REPEAT))
+    await hass.async_stop(force=True)
+    return {
+        "entities": len(entities),
+        "device_states_per_second": round(rounds / elapsed),
+    }
+
+
+async def run_suite(
+    duration: float, port: int, transport: str
+) -> dict[str, dict[str, float]]:
+    """Run every benchmark and return the results by benchmark name."""
+    results = {"parse_response": bench_parse(rounds=20000)}
+    async with simulated_fleet(max(DEVICE_COUNTS), port, []) as hosts:
+        results["client_request"] = await bench_client(hosts[0], duration, transport)
+        for count in DEVICE_COUNTS:
+            results[f"update_cycle_{count}"] = await bench_update_cycles(
+                hosts[:count], duration, transport
+            )
+        results["entity_state"] = await bench_entities(hosts[0], rounds=2000)
+    return results
+
+
+def _higher_is_better(metric: str) -> bool | None:
+    """Return the direction of a metric, None if it is not compared."""
+    if metric.endswith("_per_second"):
+        return True
+    # Tail latencies are reported but too noisy to gate on
+    if metric.endswith("_p50_ms"):
+        return False
+    return None
+
+
+def best_of(runs: list[dict[str, dict[str, float]]]) -> dict[str, dict[str, float]]:
+    """Merge several runs, keeping the best value of every metric."""
+    best: dict[str, dict[str, float]] = {}
+    for name, metrics in runs[0].items():
+        best[name] = {}
+        for metric in metrics:
+            # Lowest latencies and CPU times; highest throughputs, and errors of
+            # the worst run
+            keep = min if "_ms" in metric else max
+            best[name][metric] = keep(run[name][metric] for run in runs)
+    return best
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Return a line for every metric that regressed beyond the threshold."""
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline.get(name, {}).get(metric)
+            higher_is_better = _higher_is_better(metric)
+            if reference is None or higher_is_better is None or not reference:
+                continue
+            change = (value - reference) / reference
+            if higher_is_better:
+                regressed = change < -threshold
+            else:
+                regressed = change > threshold and value - reference > LATENCY_NOISE_MS
+            if regressed:
+                regressions.append(
+                    f"{name}.{metric}: {value} vs {reference} ({change:+.0%})"
+                )
+    return regressions
+
+
+def mismatch(report: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Return the run conditions in which the baseline differs from the report."""
+    return [
+        f"{key}: {baseline.get(key)} in the baseline, {report[key]} now"
+        for key in RUN_CONDITIONS
+        if baseline.get(key) != report[key]
+    ]
+
+
+def main() -> None:
+    """Run the suite, then print, save or check the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per run")
+    parser.add_argument("--port", type=int, default=18000, help="first port")
+    parser.add_argument(
+        "--runs", type=int, default=3, help="runs, the best value of each is kept"
+    )
+    parser.add_argument(
+        "--transport",
+        choices=(TRANSPORT_AIOHTTP, TRANSPORT_RAW),
+        default=TRANSPORT_AIOHTTP,
+        help="HTTP client of the client and update cycle benchmarks",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed regression (0.25=25%%)"
+    )
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--check", action="store_true", help="compare with baseline")
+    action.add_argument("--update", action="store_true", help="save as baseline")
+    args = parser.parse_args()
+
+    results = best_of(
+        [
+            asyncio.run(run_suite(args.duration, args.port, args.transport))
+            for _ in range(args.runs)
+        ]
+    )
+    report: dict[str, Any] = {
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "transport": args.transport,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.update:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    elif args.check:
+        if not args.baseline.exists():
+            print(
+                f"No baseline at {args.baseline}; record one on this machine "
+                "with --update first",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if differences := mismatch(report, baseline):
+            print(
+                "Baseline recorded in other conditions, run --update again:",
+                *differences,
+                sep="\n  ",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+        if regressions := compare(results, baseline["results"], args.threshold):
+            print("Regressions:", *regressions, sep="\n  ", file=sys.stderr)
+            sys.exit(1)
+        print("No regression beyond the threshold", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
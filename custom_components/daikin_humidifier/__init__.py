@@ -8,19 +8,57 @@ https://github.com/longlife1st/ha_daikin_humidifier_integration
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.const import CONF_HOST, Platform
+from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.loader import async_get_loaded_integration
+from homeassistant.util.hass_dict import HassKey
 
 from .api import DaikinApiClient
-from .const import DOMAIN, LOGGER
-from .coordinator import DaikinDataUpdateCoordinator
-from .data import DaikinData
+from .const import (
+    CONF_CONTROL_INTERVAL,
+    CONF_DEADBAND,
+    CONF_DEADBAND_RELATIVE,
+    CONF_HISTORY_WINDOW,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_REPORT_INTERVAL,
+    CONF_MAX_RETRIES,
+    CONF_MIN_REPORT_INTERVAL,
+    CONF_RECORD_TRAFFIC,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SENSOR_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    CONF_TRANSPORT,
+    DEFAULT_CONTROL_INTERVAL,
+    DEFAULT_HISTORY_WINDOW,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SENSOR_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_TRANSPORT,
+    DOMAIN,
+    LOGGER,
+    TRAFFIC_FILE,
+)
+from .coordinator import HISTORY_KEYS, DaikinDataUpdateCoordinator, cache_store
+from .data import DaikinData, ReportPolicy
+from .fleet import async_get_fleet
+from .recording import TrafficRecorder
+from .services import async_setup_services
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from collections.abc import Mapping
+
+    from homeassistant.core import Event, HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import DaikinConfigEntry
 
@@ -32,6 +70,16 @@ PLATFORMS: list[Platform] = [
     Platform.SELECT,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+DATA_TRAFFIC_RECORDER: HassKey[TrafficRecorder] = HassKey(f"{DOMAIN}_traffic")
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the services, which serve every config entry."""
+    async_setup_services(hass)
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -43,22 +91,40 @@ async def async_setup_entry(
         hass=hass,
         logger=LOGGER,
         name=DOMAIN,
-        update_interval=timedelta(seconds=60),
+        intervals=_intervals(entry.options),
+        history_window=_history_window(entry.options),
     )
+    _configure_coordinator(coordinator, entry.options)
+    fleet = async_get_fleet(hass)
+    client = DaikinApiClient(
+        host=entry.data[CONF_HOST],
+        session=async_get_clientsession(hass),
+        limiter=fleet.limiter,
+    )
+    client.mac = entry.unique_id
+    _configure_client(client, entry.options)
+    _configure_recording(hass, client, entry.options)
+    entry.async_on_unload(client.close)
     entry.runtime_data = DaikinData(
-        client=DaikinApiClient(
-            host=entry.data[CONF_HOST],
-            session=async_get_clientsession(hass),
-        ),
+        client=client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_restore():
+        # Entities come up from the last-known state while the device is polled
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN} first refresh {entry.title}",
+        )
+    else:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await coordinator.async_config_entry_first_refresh()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(fleet.async_register(coordinator))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
@@ -71,9 +137,110 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
-async def async_reload_entry(
+async def async_remove_entry(
     hass: HomeAssistant,
     entry: DaikinConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Remove the last-known state of a removed entry."""
+    await cache_store(hass, entry.entry_id).async_remove()
+
+
+async def async_update_options(
+    hass: HomeAssistant,
+    entry: DaikinConfigEntry,
+) -> None:
+    """Apply changed options and host to the running entry, without reloading it."""
+    coordinator = entry.runtime_data.coordinator
+    client = entry.runtime_data.client
+    if entry.data[CONF_HOST] != client.host:
+        client.set_host(entry.data[CONF_HOST])
+        # Everything is due at the new address right away
+        for key in coordinator.intervals:
+            coordinator.async_expire(key)
+        await coordinator.async_request_refresh()
+    previous_interval = coordinator.poll_interval
+    coordinator.async_set_intervals(
+        _intervals(entry.options), _history_window(entry.options)
+    )
+    if coordinator.poll_interval != previous_interval:
+        async_get_fleet(hass).async_reschedule(coordinator)
+    _configure_coordinator(coordinator, entry.options)
+    _configure_client(client, entry.options)
+    _configure_recording(hass, client, entry.options)
+
+
+def _intervals(options: Mapping[str, Any]) -> dict[str, timedelta]:
+    """Return the polling interval of each block set in the options."""
+    return {
+        "control": timedelta(
+            seconds=options.get(CONF_CONTROL_INTERVAL, DEFAULT_CONTROL_INTERVAL)
+        ),
+        "sensors": timedelta(
+            seconds=options.get(CONF_SENSOR_INTERVAL, DEFAULT_SENSOR_INTERVAL)
+        ),
+        "status": timedelta(
+            seconds=options.get(CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL)
+        ),
+    }
+
+
+def _history_window(options: Mapping[str, Any]) -> timedelta:
+    """Return the history window set in the options."""
+    return timedelta(minutes=options.get(CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW))
+
+
+def _configure_coordinator(
+    coordinator: DaikinDataUpdateCoordinator, options: Mapping[str, Any]
+) -> None:
+    """Apply the statistics and reporting options to the coordinator."""
+    coordinator.async_set_long_term_statistics(
+        enabled=options.get(CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS)
+    )
+    coordinator.async_set_report_policies(_report_policies(options))
+
+
+def _report_policies(options: Mapping[str, Any]) -> dict[str, ReportPolicy]:
+    """Return the reporting policy of each sensor reading set in the options."""
+    return {
+        key: ReportPolicy(
+            absolute=options.get(f"{key}_{CONF_DEADBAND}", 0),
+            relative=options.get(f"{key}_{CONF_DEADBAND_RELATIVE}", 0) / 100,
+            min_interval=options.get(f"{key}_{CONF_MIN_REPORT_INTERVAL}", 0),
+            max_interval=options.get(f"{key}_{CONF_MAX_REPORT_INTERVAL}", 0),
+        )
+        for key in HISTORY_KEYS
+    }
+
+
+def _configure_client(client: DaikinApiClient, options: Mapping[str, Any]) -> None:
+    """Apply the request options to the client."""
+    client.timeout = options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT)
+    client.max_retries = options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES)
+    client.max_concurrency = options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+    client.set_transport(options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT))
+
+
+@callback
+def _configure_recording(
+    hass: HomeAssistant, client: DaikinApiClient, options: Mapping[str, Any]
+) -> None:
+    """Record the client's traffic if the options ask for it."""
+    if options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC):
+        client.recorder = _async_get_traffic_recorder(hass)
+    else:
+        client.recorder = None
+
+
+@callback
+def _async_get_traffic_recorder(hass: HomeAssistant) -> TrafficRecorder:
+    """Return the traffic recorder shared by all config entries."""
+    if (recorder := hass.data.get(DATA_TRAFFIC_RECORDER)) is None:
+        recorder = hass.data[DATA_TRAFFIC_RECORDER] = TrafficRecorder(
+            Path(hass.config.path(TRAFFIC_FILE))
+        )
+
+        async def _async_close(_event: Event) -> None:
+            await hass.async_add_executor_job(recorder.close)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return recorder
@@ -1,20 +1,48 @@
-"""Daikin API Client."""
+"""
+Daikin API Client.
+
+Like const, data, models, recording, scheduler, stats and transport, this
+module only depends on aiohttp, so the client and the response parsing can
+be used without Home Assistant; see scripts/poll_fleet.py.
+"""
 
 from __future__ import annotations
 
-import socket
+import asyncio
+from enum import StrEnum
+from time import monotonic, time
 
 import aiohttp
-import async_timeout
 
 from .const import (
+    BREAKER_BACKOFF,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_BACKOFF,
+    CONTROL_WRITE_WINDOW,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_REQUEST_TIMEOUT,
     ENDPOINT_BASIC_INFO,
     ENDPOINT_CONTROL_INFO,
     ENDPOINT_MODEL_INFO,
     ENDPOINT_SENSOR_INFO,
     ENDPOINT_SET_CONTROL,
     ENDPOINT_UNIT_STATUS,
+    RETRY_DELAY,
+    TRANSPORT_AIOHTTP,
+    TRANSPORT_RAW,
+    TRANSPORT_REPLAY,
 )
+from .recording import ERROR_TIMEOUT, ReplayTransport, TrafficRecord, TrafficRecorder
+from .scheduler import DaikinRequestScheduler, RequestPriority
+from .stats import EndpointStats
+from .transport import AiohttpTransport, RawTransport
+
+# Priority of the requests to each endpoint; anything else is a POLL
+_ENDPOINT_PRIORITY = {
+    ENDPOINT_SET_CONTROL: RequestPriority.WRITE,
+    ENDPOINT_CONTROL_INFO: RequestPriority.CONTROL,
+}
 
 
 class DaikinApiClientError(Exception):
@@ -29,13 +57,94 @@ class DaikinApiClientAuthenticationError(DaikinApiClientError):
     """Exception to indicate an authentication error."""
 
 
-def _parse_response(response_text: str) -> dict[str, str]:
+class DaikinApiClientNotSupportedError(DaikinApiClientError):
+    """Exception to indicate an endpoint the device does not have."""
+
+
+class BreakerState(StrEnum):
+    """State of a device's circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class DaikinCircuitBreaker:
+    """
+    Track whether a device answers, to fail fast while it does not.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failed rounds the breaker
+    opens and requests fail immediately. Requests sent together, like the
+    blocks of one refresh, are one round: only the first of them to fail
+    counts. Once the backoff has passed a single probe is let through (half
+    open); success closes the breaker, failure opens it again with the
+    backoff doubled up to BREAKER_MAX_BACKOFF.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed breaker."""
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.backoff: float = BREAKER_BACKOFF
+        self._retry_at = 0.0
+        # Monotonic time of the last failure counted
+        self._failed_at = float("-inf")
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed."""
+        return max(0.0, self._retry_at - monotonic())
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent, moving to half open if due."""
+        if self.state is BreakerState.CLOSED:
+            return True
+        if self.state is BreakerState.OPEN and monotonic() >= self._retry_at:
+            self.state = BreakerState.HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after the device answered."""
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.backoff = BREAKER_BACKOFF
+
+    def record_failure(self, sent_at: float) -> None:
+        """
+        Count a communication error, opening the breaker if needed.
+
+        Args:
+            sent_at: Monotonic time the failed request was sent; one sent
+                before the last failure was counted is of the same round
+
+        """
+        if sent_at < self._failed_at and self.state is not BreakerState.HALF_OPEN:
+            return
+        self._failed_at = monotonic()
+        self.failures += 1
+        if self.state is BreakerState.HALF_OPEN:
+            self.backoff = min(self.backoff * 2, BREAKER_MAX_BACKOFF)
+        elif self.failures < BREAKER_FAILURE_THRESHOLD:
+            return
+        self.state = BreakerState.OPEN
+        self._retry_at = monotonic() + self.backoff
+
+    def release_probe(self) -> None:
+        """Let the next request probe again, after a probe ended undecided."""
+        self.state = BreakerState.OPEN
+        self._retry_at = monotonic()
+
+
+def _parse_response(response_text: str | bytes) -> dict[str, str]:
     """
     Parse Daikin key=value format response.
 
     Example: "ret=OK,pow=1,mode=1,humd=2,airvol=3"
     Returns: {"ret": "OK", "pow": "1", "mode": "1", "humd": "2", "airvol": "3"}
     """
+    if isinstance(response_text, bytes):
+        response_text = response_text.decode("utf-8", "replace")
     result = {}
     for pair in response_text.split(","):
         if "=" in pair:
@@ -44,21 +153,60 @@ def _parse_response(response_text: str) -> dict[str, str]:
     return result
 
 
-def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
-    """Verify that the response is valid."""
-    if response.status in (401, 403):
+def build_control_params(
+    power: str | None = None,
+    mode: str | None = None,
+    humidity: str | None = None,
+    fan_speed: str | None = None,
+) -> dict[str, str]:
+    """Map control arguments to the device's set_control_info parameters."""
+    params = {}
+    if power is not None:
+        params["pow"] = power
+    if mode is not None:
+        params["mode"] = mode
+    if humidity is not None:
+        params["humd"] = humidity
+    if fan_speed is not None:
+        params["airvol"] = fan_speed
+    return params
+
+
+def _verify_status_or_raise(status: int) -> None:
+    """Verify that the response status is valid."""
+    if status in (401, 403):
         msg = "Invalid credentials"
         raise DaikinApiClientAuthenticationError(msg)
-    response.raise_for_status()
+    if status == 404:  # noqa: PLR2004
+        msg = "Endpoint not supported by the device - HTTP status 404"
+        raise DaikinApiClientNotSupportedError(msg)
+    if status >= 400:  # noqa: PLR2004
+        msg = f"Error fetching information - HTTP status {status}"
+        raise DaikinApiClientCommunicationError(msg)
+
+
+def _verify_mac_or_raise(host: str, expected: str | None, info: dict[str, str]) -> None:
+    """Verify that the unit answering at host is the expected one."""
+    if expected and (mac := info.get("mac")) and mac != expected:
+        # The address went to another unit
+        msg = f"{host} is now unit {mac}"
+        raise DaikinApiClientCommunicationError(msg)
 
 
 class DaikinApiClient:
-    """Daikin API Client for local HTTP communication."""
+    """
+    Daikin API Client for local HTTP communication.
+
+    The request timeout, retries, requests in flight and transport can be
+    changed at any time; requests already sent finish with the old values.
+    """
 
     def __init__(
         self,
         host: str,
         session: aiohttp.ClientSession,
+        limiter: DaikinRequestScheduler | None = None,
+        transport: str = TRANSPORT_AIOHTTP,
     ) -> None:
         """
         Initialize Daikin API Client.
@@ -66,11 +214,88 @@ class DaikinApiClient:
         Args:
             host: IP address or hostname of the Daikin device
             session: aiohttp client session
+            limiter: Scheduler shared with other clients to cap the requests
+                in flight across them, in the same priority order
+            transport: TRANSPORT_AIOHTTP to send requests through the session,
+                or TRANSPORT_RAW for the minimal asyncio client that keeps one
+                connection to the device open
 
         """
         self._host = host
+        # MAC of the unit expected at host, checked when probing it again
+        self.mac: str | None = None
         self._session = session
+        self._limiter = limiter
+        self.breaker = DaikinCircuitBreaker()
+        # Request statistics keyed by endpoint path
+        self.stats: dict[str, EndpointStats] = {}
         self._base_url = f"http://{host}"
+        # Seconds before a request times out, and retries after a
+        # communication error
+        self.timeout: float = DEFAULT_REQUEST_TIMEOUT
+        self.max_retries = DEFAULT_MAX_RETRIES
+        # Orders the requests to the device: writes before control polls
+        # before sensor and status polls
+        self.scheduler = DaikinRequestScheduler(DEFAULT_MAX_CONCURRENCY)
+        self.transport_name = transport
+        self._transport: AiohttpTransport | RawTransport | ReplayTransport = (
+            self._create_transport(transport)
+        )
+        # Gets a TrafficRecord of every request sent when set
+        self.recorder: TrafficRecorder | None = None
+        self._pending_control: dict[str, str] = {}
+        self._control_write: asyncio.Task[dict[str, str]] | None = None
+        # Control writes sent and not answered yet, oldest first
+        self._sending_control: list[dict[str, str]] = []
+
+    @property
+    def host(self) -> str:
+        """Return the address of the device."""
+        return self._host
+
+    @property
+    def max_concurrency(self) -> int:
+        """Return the most requests sent to the device at once."""
+        return self.scheduler.max_in_flight
+
+    @max_concurrency.setter
+    def max_concurrency(self, value: int) -> None:
+        """Set the most requests sent to the device at once."""
+        self.scheduler.max_in_flight = value
+
+    def set_host(self, host: str) -> None:
+        """Send the next requests to the unit at another address."""
+        if host == self._host:
+            return
+        previous = self._transport
+        self._host = host
+        self._base_url = f"http://{host}"
+        self._transport = self._create_transport(self.transport_name)
+        previous.close()
+        # Failures at the old address say nothing about the new one
+        self.breaker = DaikinCircuitBreaker()
+
+    def set_replay(self, transport: ReplayTransport) -> None:
+        """Answer the next requests from captured traffic instead of the unit."""
+        previous = self._transport
+        self.transport_name = TRANSPORT_REPLAY
+        self._transport = transport
+        previous.close()
+
+    def _create_transport(self, name: str) -> AiohttpTransport | RawTransport:
+        """Return the transport called name."""
+        if name == TRANSPORT_RAW:
+            return RawTransport(self._host)
+        return AiohttpTransport(self._session, self._base_url)
+
+    def set_transport(self, name: str) -> None:
+        """Send the next requests through another transport."""
+        if name == self.transport_name:
+            return
+        previous = self._transport
+        self.transport_name = name
+        self._transport = self._create_transport(name)
+        previous.close()
 
     async def async_get_basic_info(self) -> dict[str, str]:
         """Get basic device information."""
@@ -110,22 +335,53 @@ class DaikinApiClient:
             fan_speed: Fan speed (0-5)
 
         """
-        params = {}
-        if power is not None:
-            params["pow"] = power
-        if mode is not None:
-            params["mode"] = mode
-        if humidity is not None:
-            params["humd"] = humidity
-        if fan_speed is not None:
-            params["airvol"] = fan_speed
-
-        return await self._api_wrapper(
-            method="get",  # API accepts both GET and POST
-            url=self._base_url + ENDPOINT_SET_CONTROL,
-            params=params,
+        return await self.async_write_control(
+            build_control_params(
+                power=power,
+                mode=mode,
+                humidity=humidity,
+                fan_speed=fan_speed,
+            )
         )
 
+    async def async_write_control(self, params: dict[str, str]) -> dict[str, str]:
+        """
+        Write raw control parameters (pow, mode, humd, airvol).
+
+        Changes made by several callers within CONTROL_WRITE_WINDOW are merged
+        and sent as one request, whose response every caller receives.
+        """
+        self._pending_control.update(params)
+        if self._control_write is None:
+            self._control_write = asyncio.create_task(self._async_flush_control())
+        # Shielded so a cancelled caller does not drop the other callers' changes
+        return await asyncio.shield(self._control_write)
+
+    async def _async_flush_control(self) -> dict[str, str]:
+        """Send the control changes queued during the write window."""
+        await asyncio.sleep(CONTROL_WRITE_WINDOW)
+        params = self._pending_control
+        self._pending_control = {}
+        self._control_write = None
+        self._sending_control.append(params)
+        try:
+            return await self._api_wrapper(
+                method="get",  # API accepts both GET and POST
+                url=self._base_url + ENDPOINT_SET_CONTROL,
+                params=params,
+            )
+        finally:
+            self._sending_control.remove(params)
+
+    @property
+    def pending_control(self) -> dict[str, str]:
+        """Return the control changes written but not answered yet."""
+        pending: dict[str, str] = {}
+        for params in self._sending_control:
+            pending.update(params)
+        pending.update(self._pending_control)
+        return pending
+
     async def async_get_sensor_info(self) -> dict[str, str]:
         """Get sensor data (PM2.5, temperature, humidity)."""
         return await self._api_wrapper(
@@ -140,6 +396,15 @@ class DaikinApiClient:
             url=self._base_url + ENDPOINT_UNIT_STATUS,
         )
 
+    @property
+    def available(self) -> bool:
+        """Return False while the circuit breaker is open."""
+        return self.breaker.state is not BreakerState.OPEN
+
+    def close(self) -> None:
+        """Close the connections the transport keeps open."""
+        self._transport.close()
+
     async def _api_wrapper(
         self,
         method: str,
@@ -147,23 +412,173 @@ class DaikinApiClient:
         params: dict | None = None,
     ) -> dict[str, str]:
         """Get information from the API."""
-        try:
-            async with async_timeout.timeout(10):
-                response = await self._session.request(
-                    method=method,
-                    url=url,
-                    params=params,
+        breaker = self.breaker
+        sent_at = monotonic()
+        if not breaker.allow_request():
+            msg = (
+                f"{self._host} is not answering, "
+                f"next attempt in {breaker.retry_in:.0f} s"
+            )
+            raise DaikinApiClientCommunicationError(msg)
+
+        if breaker.state is BreakerState.HALF_OPEN:
+            # Probe with a cheap request before letting real traffic through
+            try:
+                info = await self._async_limited_request(
+                    "get", self._base_url + ENDPOINT_BASIC_INFO
                 )
-                _verify_response_or_raise(response)
-                response_text = await response.text()
-                return _parse_response(response_text)
+                _verify_mac_or_raise(self._host, self.mac, info)
+            except DaikinApiClientCommunicationError:
+                breaker.record_failure(sent_at)
+                raise
+            except BaseException:
+                # Cancelled, or answered with an error that says nothing
+                # about reachability
+                breaker.release_probe()
+                raise
+            breaker.record_success()
+
+        try:
+            result = await self._async_retried_request(method, url, params)
+        except DaikinApiClientCommunicationError:
+            breaker.record_failure(sent_at)
+            raise
+        breaker.record_success()
+        return result
+
+    async def _async_retried_request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+    ) -> dict[str, str]:
+        """Send a request, retrying up to max_retries communication errors."""
+        attempt = 0
+        while True:
+            try:
+                return await self._async_limited_request(method, url, params)
+            except DaikinApiClientCommunicationError:
+                if attempt >= self.max_retries:
+                    raise
+            await asyncio.sleep(RETRY_DELAY * 2**attempt)
+            attempt += 1
+
+    async def _async_limited_request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+    ) -> dict[str, str]:
+        """Send a request once the device's scheduler gives it its turn."""
+        endpoint = url.removeprefix(self._base_url)
+        priority = _ENDPOINT_PRIORITY.get(endpoint, RequestPriority.POLL)
+        # Identical queued reads are sent once; writes never are shared
+        key = None if params else f"{method} {endpoint}"
+        return await self.scheduler.async_submit(
+            priority, key, lambda: self._async_send(priority, method, url, params)
+        )
+
+    async def _async_send(
+        self,
+        priority: RequestPriority,
+        method: str,
+        url: str,
+        params: dict | None = None,
+    ) -> dict[str, str]:
+        """Send a request once the shared limiter gives it its turn."""
+        if self._limiter is None:
+            return await self._async_request(method, url, params)
+        # Requests of all devices queue here, so writes pass other devices'
+        # polls too; the device's own scheduler already shares reads
+        return await self._limiter.async_submit(
+            priority, None, lambda: self._async_request(method, url, params)
+        )
+
+    async def _async_request(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+    ) -> dict[str, str]:
+        """Send a request, parse the response and record its statistics."""
+        endpoint = url.removeprefix(self._base_url)
+        if (stats := self.stats.get(endpoint)) is None:
+            stats = self.stats[endpoint] = EndpointStats()
+        start = monotonic()
+        try:
+            status, body = await self._async_send_timed(method, endpoint, params)
+            _verify_status_or_raise(status)
 
         except TimeoutError as exception:
+            stats.timeouts += 1
             msg = f"Timeout error fetching information - {exception}"
             raise DaikinApiClientCommunicationError(msg) from exception
-        except (aiohttp.ClientError, socket.gaierror) as exception:
+        except (
+            DaikinApiClientCommunicationError,
+            DaikinApiClientNotSupportedError,
+        ):
+            stats.errors += 1
+            raise
+        except (aiohttp.ClientError, OSError) as exception:
+            stats.errors += 1
             msg = f"Error fetching information - {exception}"
             raise DaikinApiClientCommunicationError(msg) from exception
         except Exception as exception:  # pylint: disable=broad-except
+            stats.errors += 1
             msg = f"Something really wrong happened! - {exception}"
             raise DaikinApiClientError(msg) from exception
+
+        stats.latency.record(monotonic() - start)
+        stats.bytes_received += len(body)
+        stats.last_success = time()
+        return _parse_response(body)
+
+    async def _async_send_timed(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict | None = None,
+    ) -> tuple[int, bytes]:
+        """Send a request through the transport, recording it if asked to."""
+        if (recorder := self.recorder) is None:
+            async with asyncio.timeout(self.timeout):
+                return await self._transport.async_request(method, endpoint, params)
+
+        sent_at = time()
+        start = monotonic()
+        try:
+            async with asyncio.timeout(self.timeout):
+                status, body = await self._transport.async_request(
+                    method, endpoint, params
+                )
+        except Exception as exception:
+            error = (
+                ERROR_TIMEOUT
+                if isinstance(exception, TimeoutError)
+                else type(exception).__name__
+            )
+            recorder.record(
+                TrafficRecord(
+                    sent_at,
+                    self._host,
+                    method,
+                    endpoint,
+                    params,
+                    monotonic() - start,
+                    error=error,
+                )
+            )
+            raise
+        recorder.record(
+            TrafficRecord(
+                sent_at,
+                self._host,
+                method,
+                endpoint,
+                params,
+                monotonic() - start,
+                status=status,
+                body=body,
+            )
+        )
+        return status, body
@@ -34,9 +34,12 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the binary_sensor platform."""
+    coordinator = entry.runtime_data.coordinator
+    if "status" not in coordinator.profile.blocks:
+        return
     async_add_entities(
         DaikinBinarySensor(
-            coordinator=entry.runtime_data.coordinator,
+            coordinator=coordinator,
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
@@ -52,7 +55,7 @@ class DaikinBinarySensor(DaikinEntity, BinarySensorEntity):
         entity_description: BinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary_sensor class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({entity_description.key}))
         self.entity_description = entity_description
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{entity_description.key}"
@@ -61,7 +64,4 @@ class DaikinBinarySensor(DaikinEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Return true if the binary_sensor is on."""
-        status = self.coordinator.data.get("status", {})
-        value = status.get(self.entity_description.key)
-        # Assuming "1" means filter needs replacement
-        return value == "1"
+        return self.coordinator.data.filter_sign is True
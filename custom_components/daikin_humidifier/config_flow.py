@@ -4,9 +4,14 @@ from __future__ import annotations
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST
+from homeassistant.const import CONF_HOST, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import section
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.aiohttp_client import (
+    async_create_clientsession,
+    async_get_clientsession,
+)
 
 from .api import (
     DaikinApiClient,
@@ -14,7 +19,137 @@ from .api import (
     DaikinApiClientCommunicationError,
     DaikinApiClientError,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_CONTROL_INTERVAL,
+    CONF_DEADBAND,
+    CONF_DEADBAND_RELATIVE,
+    CONF_HISTORY_WINDOW,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_REPORT_INTERVAL,
+    CONF_MAX_RETRIES,
+    CONF_MIN_REPORT_INTERVAL,
+    CONF_RECORD_TRAFFIC,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SENSOR_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    CONF_TRANSPORT,
+    DEFAULT_CONTROL_INTERVAL,
+    DEFAULT_HISTORY_WINDOW,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SENSOR_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_TRANSPORT,
+    DOMAIN,
+    LOGGER,
+    TRANSPORT_AIOHTTP,
+    TRANSPORT_RAW,
+)
+from .coordinator import HISTORY_KEYS
+from .discovery import (
+    DiscoveredDevice,
+    async_get_scan_networks,
+    async_scan,
+    device_name,
+)
+
+CONF_DEVICES = "devices"
+
+INTERVAL_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=5,
+        max=86400,
+        step=1,
+        mode=selector.NumberSelectorMode.BOX,
+        unit_of_measurement=UnitOfTime.SECONDS,
+    ),
+)
+
+HISTORY_WINDOW_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=1,
+        max=1440,
+        step=1,
+        mode=selector.NumberSelectorMode.BOX,
+        unit_of_measurement=UnitOfTime.MINUTES,
+    ),
+)
+
+REQUEST_TIMEOUT_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=1,
+        max=60,
+        step=1,
+        mode=selector.NumberSelectorMode.BOX,
+        unit_of_measurement=UnitOfTime.SECONDS,
+    ),
+)
+
+MAX_RETRIES_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0,
+        max=5,
+        step=1,
+        mode=selector.NumberSelectorMode.BOX,
+    ),
+)
+
+MAX_CONCURRENCY_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=1,
+        max=8,
+        step=1,
+        mode=selector.NumberSelectorMode.BOX,
+    ),
+)
+
+DEADBAND_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0,
+        max=100,
+        step=0.1,
+        mode=selector.NumberSelectorMode.BOX,
+    ),
+)
+
+RELATIVE_DEADBAND_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0,
+        max=100,
+        step=1,
+        mode=selector.NumberSelectorMode.BOX,
+        unit_of_measurement="%",
+    ),
+)
+
+REPORT_INTERVAL_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0,
+        max=86400,
+        step=1,
+        mode=selector.NumberSelectorMode.BOX,
+        unit_of_measurement=UnitOfTime.SECONDS,
+    ),
+)
+
+# Reporting options of each sensor reading and their selectors
+REPORT_OPTIONS = {
+    CONF_DEADBAND: DEADBAND_SELECTOR,
+    CONF_DEADBAND_RELATIVE: RELATIVE_DEADBAND_SELECTOR,
+    CONF_MIN_REPORT_INTERVAL: REPORT_INTERVAL_SELECTOR,
+    CONF_MAX_REPORT_INTERVAL: REPORT_INTERVAL_SELECTOR,
+}
+
+TRANSPORT_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[TRANSPORT_AIOHTTP, TRANSPORT_RAW],
+        translation_key=CONF_TRANSPORT,
+    ),
+)
 
 
 class DaikinFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -22,11 +157,120 @@ class DaikinFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._discovered: dict[str, DiscoveredDevice] = {}
+        # Configured entries of the discovered units found at another address
+        self._moved: dict[str, config_entries.ConfigEntry] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> DaikinOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return DaikinOptionsFlowHandler()
+
     async def async_step_user(
         self,
-        user_input: dict | None = None,
+        user_input: dict | None = None,  # noqa: ARG002
     ) -> config_entries.ConfigFlowResult:
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(step_id="user", menu_options=["scan", "manual"])
+
+    async def async_step_scan(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Scan the local networks and add or move the units picked."""
+        if user_input is not None and user_input[CONF_DEVICES]:
+            devices = []
+            for mac in user_input[CONF_DEVICES]:
+                device = self._discovered[mac]
+                if (entry := self._moved.get(mac)) is None:
+                    devices.append(device)
+                    continue
+                # Applied to the running entry by its update listener
+                self.hass.config_entries.async_update_entry(
+                    entry, data={**entry.data, CONF_HOST: device.host}
+                )
+            if not devices:
+                return self.async_abort(reason="moved")
+            # This flow adds the first unit, a flow of its own each other one
+            for device in devices[1:]:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                        data=device,
+                    ),
+                    eager_start=True,
+                )
+            return await self.async_step_integration_discovery(devices[0])
+
+        if not self._discovered:
+            devices = await async_scan(
+                async_get_clientsession(self.hass),
+                await async_get_scan_networks(self.hass),
+            )
+            configured = {
+                entry.unique_id: entry
+                for entry in self._async_current_entries(include_ignore=False)
+            }
+            for device in devices:
+                if (entry := configured.get(device.mac)) is None:
+                    self._discovered[device.mac] = device
+                elif entry.data[CONF_HOST] != device.host:
+                    self._discovered[device.mac] = device
+                    self._moved[device.mac] = entry
+            if not self._discovered:
+                return self.async_abort(reason="no_devices_found")
+
+        options = [
+            selector.SelectOptionDict(
+                value=device.mac,
+                label=f"{device.name} ({device.host}, {device.mac})"
+                if (entry := self._moved.get(device.mac)) is None
+                else f"{entry.title} ({entry.data[CONF_HOST]} → {device.host})",
+            )
+            for device in self._discovered.values()
+        ]
+
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_DEVICES): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=options,
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.LIST,
+                        ),
+                    ),
+                },
+            ),
+        )
+
+    async def async_step_integration_discovery(
+        self,
+        discovery_info: DiscoveredDevice,
+    ) -> config_entries.ConfigFlowResult:
+        """Add a unit picked from the scan results."""
+        await self.async_set_unique_id(discovery_info.mac)
+        # A known unit found at another address is moved there in place
+        self._abort_if_unique_id_configured(
+            updates={CONF_HOST: discovery_info.host}, reload_on_update=False
+        )
+        return self.async_create_entry(
+            title=discovery_info.name,
+            data={CONF_HOST: discovery_info.host},
+        )
+
+    async def async_step_manual(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Add a unit by its address."""
         _errors = {}
         if user_input is not None:
             try:
@@ -49,7 +293,7 @@ class DaikinFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 self._abort_if_unique_id_configured()
 
                 # Use device name as title if available, otherwise use host
-                title = info.get("name", user_input[CONF_HOST])
+                title = device_name(info, user_input[CONF_HOST])
 
                 return self.async_create_entry(
                     title=title,
@@ -57,7 +301,7 @@ class DaikinFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=vol.Schema(
                 {
                     vol.Required(
@@ -80,3 +324,129 @@ class DaikinFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             session=async_create_clientsession(self.hass),
         )
         return await client.async_get_basic_info()
+
+
+def _whole(value: object) -> object:
+    """Return a number selector's float as an int when it is whole."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class DaikinOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for Daikin Humidifier."""
+
+    def __init__(self) -> None:
+        """Initialize the options flow."""
+        self._options: dict[str, object] = {}
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the polling, history and request options of the unit."""
+        if user_input is not None:
+            self._options = {key: _whole(value) for key, value in user_input.items()}
+            return await self.async_step_reporting()
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_CONTROL_INTERVAL,
+                        default=options.get(
+                            CONF_CONTROL_INTERVAL, DEFAULT_CONTROL_INTERVAL
+                        ),
+                    ): INTERVAL_SELECTOR,
+                    vol.Required(
+                        CONF_SENSOR_INTERVAL,
+                        default=options.get(
+                            CONF_SENSOR_INTERVAL, DEFAULT_SENSOR_INTERVAL
+                        ),
+                    ): INTERVAL_SELECTOR,
+                    vol.Required(
+                        CONF_STATUS_INTERVAL,
+                        default=options.get(
+                            CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL
+                        ),
+                    ): INTERVAL_SELECTOR,
+                    vol.Required(
+                        CONF_HISTORY_WINDOW,
+                        default=options.get(
+                            CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW
+                        ),
+                    ): HISTORY_WINDOW_SELECTOR,
+                    vol.Required(
+                        CONF_LONG_TERM_STATISTICS,
+                        default=options.get(
+                            CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_REQUEST_TIMEOUT,
+                        default=options.get(
+                            CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+                        ),
+                    ): REQUEST_TIMEOUT_SELECTOR,
+                    vol.Required(
+                        CONF_MAX_RETRIES,
+                        default=options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+                    ): MAX_RETRIES_SELECTOR,
+                    vol.Required(
+                        CONF_MAX_CONCURRENCY,
+                        default=options.get(
+                            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+                        ),
+                    ): MAX_CONCURRENCY_SELECTOR,
+                    vol.Required(
+                        CONF_TRANSPORT,
+                        default=options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT),
+                    ): TRANSPORT_SELECTOR,
+                    vol.Required(
+                        CONF_RECORD_TRAFFIC,
+                        default=options.get(
+                            CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC
+                        ),
+                    ): selector.BooleanSelector(),
+                },
+            ),
+        )
+
+    async def async_step_reporting(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage when each sensor reading is written to its state."""
+        if user_input is not None:
+            # Stored flat, prefixed with the reading, e.g. "pm25_deadband"
+            for key, values in user_input.items():
+                for name, value in values.items():
+                    self._options[f"{key}_{name}"] = _whole(value)
+            return self.async_create_entry(data=self._options)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="reporting",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(key): section(
+                        vol.Schema(
+                            {
+                                vol.Required(
+                                    name, default=options.get(f"{key}_{name}", 0)
+                                ): option_selector
+                                for name, option_selector in REPORT_OPTIONS.items()
+                            }
+                        ),
+                        {
+                            "collapsed": not any(
+                                options.get(f"{key}_{name}") for name in REPORT_OPTIONS
+                            )
+                        },
+                    )
+                    for key in HISTORY_KEYS
+                }
+            ),
+        )
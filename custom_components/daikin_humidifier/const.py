@@ -14,10 +14,121 @@ ENDPOINT_SET_CONTROL = "/cleaner/set_control_info"
 ENDPOINT_SENSOR_INFO = "/cleaner/get_sensor_info"
 ENDPOINT_UNIT_STATUS = "/cleaner/get_unit_status"
 
+# Polling intervals (seconds) of each endpoint
+CONF_CONTROL_INTERVAL = "control_interval"
+CONF_SENSOR_INTERVAL = "sensor_interval"
+CONF_STATUS_INTERVAL = "status_interval"
+
+DEFAULT_CONTROL_INTERVAL = 30
+DEFAULT_SENSOR_INTERVAL = 60
+DEFAULT_STATUS_INTERVAL = 3600
+
+# Window (minutes) of the rolling sensor statistics, and the most samples
+# kept per device to compute them
+CONF_HISTORY_WINDOW = "history_window"
+DEFAULT_HISTORY_WINDOW = 15
+HISTORY_MAX_SAMPLES = 1024
+
+# Long-term statistics mode: sensor readings are written to the recorder as
+# hourly statistics, and the sensors' states at most every this many seconds
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+DEFAULT_LONG_TERM_STATISTICS = False
+STATISTICS_STATE_INTERVAL = 900
+
+# Sensor reporting, set per reading: a new reading is written to the state
+# when it moves more than the absolute or relative (%) deadband from the last
+# one written, no sooner than the minimum interval (seconds) after it; a
+# smaller change is written once the maximum interval has passed. 0 turns
+# each of them off. Option keys are prefixed with the reading, e.g.
+# "pm25_deadband"
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_MIN_REPORT_INTERVAL = "min_report_interval"
+CONF_MAX_REPORT_INTERVAL = "max_report_interval"
+
+# LAN discovery: probes in flight, seconds each probe may take, and the
+# widest network scanned around each of the host's addresses
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_TIMEOUT = 1.5
+DISCOVERY_MIN_PREFIX = 24
+
+# Relocation of units that stopped answering: scans run in the background
+# with fewer probes in flight, and at most once in this many seconds
+RELOCATE_CONCURRENCY = 32
+RELOCATE_INTERVAL = 300
+
+# Blocks the device answers with a 404 this many polls in a row are no
+# longer polled, until they are tried again after this many seconds; the
+# control block is always polled
+UNSUPPORTED_STRIKES = 3
+UNSUPPORTED_RETRY = 3600
+
+# Last-known state kept in .storage, and the most seconds a refresh may wait
+# to be written there
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Requests to one device: seconds before one times out, retries after a
+# communication error (the delay doubling from RETRY_DELAY), and requests in
+# flight at most; the embedded HTTP servers handle one at a time best
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_MAX_RETRIES = "max_retries"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+DEFAULT_REQUEST_TIMEOUT = 10
+DEFAULT_MAX_RETRIES = 0
+DEFAULT_MAX_CONCURRENCY = 1
+RETRY_DELAY = 0.5
+
+# HTTP client used to talk to the devices: aiohttp, or a minimal asyncio one
+# that keeps a connection to each device open
+CONF_TRANSPORT = "transport"
+TRANSPORT_AIOHTTP = "aiohttp"
+TRANSPORT_RAW = "raw"
+DEFAULT_TRANSPORT = TRANSPORT_AIOHTTP
+# Captured traffic played back instead of a unit, in the benchmarks
+TRANSPORT_REPLAY = "replay"
+
+# Traffic recording: every request and raw answer is appended to a capture
+# file in the configuration directory, rotated to compressed backups
+CONF_RECORD_TRAFFIC = "record_traffic"
+DEFAULT_RECORD_TRAFFIC = False
+TRAFFIC_FILE = "daikin_humidifier_traffic.jsonl"
+TRAFFIC_MAX_BYTES = 10 * 1024 * 1024
+TRAFFIC_BACKUPS = 5
+
+# Fleet scheduler: requests in flight across all devices, and the random
+# offset added to each device's poll slot as a fraction of its interval
+FLEET_MAX_IN_FLIGHT = 16
+FLEET_JITTER = 0.05
+
+# Bulk control service: writes in flight by default, and the seconds over
+# which the refreshes that follow are spread
+SET_CONTROL_CONCURRENCY = 16
+REFRESH_WAVE_SPREAD = 2.0
+
+# Circuit breaker: consecutive failed rounds of requests before a device is
+# considered unreachable, and the first/maximum seconds between probes
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BACKOFF = 15
+BREAKER_MAX_BACKOFF = 600
+
+# State attribute of the entities showing data the device did not refresh:
+# restored from the cache, or kept after the last poll of it failed
+ATTR_STALE = "stale"
+
+# Control changes made within this many seconds are sent as a single request
+CONTROL_WRITE_WINDOW = 0.25
+
+# Seconds to wait before polling the device to confirm an optimistic update
+CONTROL_CONFIRM_DELAY = 10
+
 # Power states
 POWER_OFF = "0"
 POWER_ON = "1"
 
+# Filter sign ("1" means the filter needs replacement)
+FILTER_SIGN_ON = "1"
+
 # Operating modes
 MODE_AUTO = "1"  # おまかせ
 MODE_ECO = "2"  # 節電
@@ -50,6 +161,14 @@ HUMIDITY_MODES = {
 
 HUMIDITY_REVERSE = {v: k for k, v in HUMIDITY_MODES.items()}
 
+# Target humidity (%) reported for each humidity level
+HUMIDITY_TARGETS = {
+    HUMIDITY_OFF: 0,
+    HUMIDITY_LOW: 40,
+    HUMIDITY_NORMAL: 50,
+    HUMIDITY_HIGH: 60,
+}
+
 # Fan speeds
 FAN_AUTO = "0"  # 自動運転
 FAN_SILENT = "1"  # しずか
@@ -2,42 +2,560 @@
 
 from __future__ import annotations
 
+import asyncio
+from dataclasses import replace
+from datetime import timedelta
+from enum import StrEnum
+from math import ceil
+from time import monotonic, time
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import (
     DaikinApiClientAuthenticationError,
     DaikinApiClientError,
+    DaikinApiClientNotSupportedError,
+    build_control_params,
 )
+from .const import (
+    CONTROL_CONFIRM_DELAY,
+    DEFAULT_HISTORY_WINDOW,
+    DOMAIN,
+    HISTORY_MAX_SAMPLES,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    UNSUPPORTED_RETRY,
+    UNSUPPORTED_STRIKES,
+)
+from .data import DaikinDeviceState
+from .history import HourlyAggregate, SampleHistory
+from .longterm import async_add_hour
+from .models import model_profile
+from .relocation import async_get_relocator
+from .stats import LatencyHistogram
 
 if TYPE_CHECKING:
-    from .data import DaikinConfigEntry
+    from collections.abc import Awaitable, Callable, Iterable, Mapping
+    from datetime import datetime
+    from logging import Logger
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .data import DaikinConfigEntry, ReportPolicy
+    from .models import ModelProfile
+
+
+# Listener context of entities that report on the polling itself rather than
+# the device state; they are woken after every refresh
+DIAGNOSTICS_KEY = "diagnostics"
+
+# Listener context of entities showing rolling statistics; they are woken
+# after every refresh that added a sample to the history
+HISTORY_KEY = "history"
+
+# Sensor readings kept in the history
+HISTORY_KEYS = ("pm25", "hhum", "htemp")
+
+# Seconds of slack when deciding whether an endpoint is due, since the
+# coordinator timer may fire slightly before a full interval has passed
+POLL_TOLERANCE = 1
+
+
+class ControlWrite(StrEnum):
+    """Outcome of a control write."""
+
+    ACKNOWLEDGED = "acknowledged"
+    # Not sent, the device was already as asked
+    SKIPPED = "skipped"
+    REJECTED = "rejected"
+
+
+def cache_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the last-known state of an entry's device."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class DaikinDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+class DaikinDataUpdateCoordinator(DataUpdateCoordinator[DaikinDeviceState]):
+    """
+    Class to manage fetching data from the API.
+
+    Each block (control, sensors, status) has its own polling interval; the
+    device is polled at the shortest one and only the blocks that are due are
+    fetched, carrying the others over from the previous snapshot. Polls are
+    driven by the fleet scheduler rather than the coordinator's own timer.
+
+    Entities subscribe with the set of DaikinDeviceState fields they show as
+    listener context; after an update only those whose fields changed are
+    woken, and none at all if the decoded snapshot is unchanged. Listeners
+    subscribed to DIAGNOSTICS_KEY are woken after every refresh instead, and
+    those subscribed to HISTORY_KEY after every new history sample.
+
+    The raw blocks and the device's basic and model info are saved to a Store
+    after refreshes, so a restart can bring entities up from the last-known
+    state, marked stale, before the device has answered.
+
+    With long_term_statistics set, sensor samples are also aggregated per
+    clock hour and each finished hour is written to the recorder as external
+    statistics; the open hour is kept in the Store across restarts.
+    """
 
     config_entry: DaikinConfigEntry
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    # Seconds between the device's fleet poll slot and the start of its poll
+    poll_lag: float = 0.0
+
+    _confirm_unsub: CALLBACK_TYPE | None = None
+
+    # Whether sensor readings are written as hourly long-term statistics,
+    # with the sensors' own state writes throttled
+    long_term_statistics = False
+
+    # When each sensor reading is written to its state, by HISTORY_KEYS key;
+    # readings without a policy are written on every change
+    report_policies: Mapping[str, ReportPolicy] = MappingProxyType({})
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: Logger,
+        *,
+        name: str,
+        intervals: dict[str, timedelta],
+        history_window: timedelta = timedelta(minutes=DEFAULT_HISTORY_WINDOW),
+    ) -> None:
+        """Initialize the coordinator with per-block polling intervals."""
+        super().__init__(hass, logger, name=name, always_update=False)
+        self.intervals = intervals
+        self.poll_interval = min(intervals.values())
+        self._fetched_at: dict[str, float] = {}
+        self._notified: DaikinDeviceState | None = None
+        self._notified_success = False
+        self.update_duration = LatencyHistogram()
+
+        self.history_window = history_window.total_seconds()
+        self.history = self._create_history()
+        self._sampled = False
+        self.hourly = HourlyAggregate()
+
+        self._store = cache_store(hass, self.config_entry.entry_id)
+        # Fetched on the first refresh unless they were in the store
+        self.basic_info: dict[str, str] | None = None
+        self.model_info: dict[str, str] | None = None
+        self._info_attempted: set[str] = set()
+        # Consecutive 404 answers of each block's endpoint, and the monotonic
+        # time at which the blocks that got too many are tried again
+        self._not_found: dict[str, int] = {}
+        self._unsupported_until: dict[str, float] = {}
+        # Control writes left out because the device was already as asked
+        self.writes_skipped = 0
+
+    def _create_history(self) -> SampleHistory:
+        """Return an empty history sized for the window and sensor interval."""
+        # Enough room for one window of sensor polls, bounded either way
+        sensor_interval = max(self.intervals["sensors"].total_seconds(), 1)
+        return SampleHistory(
+            keys=HISTORY_KEYS,
+            windows=(self.history_window,),
+            capacity=min(
+                HISTORY_MAX_SAMPLES, ceil(self.history_window / sensor_interval) + 2
+            ),
+        )
+
+    @callback
+    def async_set_intervals(
+        self,
+        intervals: dict[str, timedelta],
+        history_window: timedelta,
+    ) -> None:
+        """
+        Change the polling intervals and the history window in place.
+
+        A block polled more often than before is due on the next poll. The
+        history is only started over when its size has to change.
+
+        Args:
+            intervals: Polling interval of each block
+            history_window: Span of the rolling sensor statistics
+
+        """
+        resize = (
+            history_window.total_seconds() != self.history_window
+            or intervals["sensors"] != self.intervals["sensors"]
+        )
+        for key, interval in intervals.items():
+            if interval < self.intervals[key]:
+                self.async_expire(key)
+        self.intervals = intervals
+        self.poll_interval = min(intervals.values())
+        if resize:
+            self.history_window = history_window.total_seconds()
+            self.history = self._create_history()
+            self._async_wake({HISTORY_KEY})
+
+    @callback
+    def async_set_long_term_statistics(self, *, enabled: bool) -> None:
+        """Turn the long-term statistics mode on or off."""
+        if enabled == self.long_term_statistics:
+            return
+        self.long_term_statistics = enabled
+        if not enabled and (hour := self.hourly.current()):
+            # The hour so far is written but stays open, so turning the mode
+            # back on within it adds to these samples instead of overwriting
+            # the row with the later ones; in a later hour it is closed as is
+            async_add_hour(self.hass, self.config_entry, *hour)
+        # The sensors change state class and throttling
+        self._async_wake(set(HISTORY_KEYS))
+
+    @callback
+    def async_set_report_policies(self, policies: Mapping[str, ReportPolicy]) -> None:
+        """Change when the sensors write new readings to their state."""
+        if policies == self.report_policies:
+            return
+        self.report_policies = policies
+        self._async_wake(set(HISTORY_KEYS))
+
+    async def async_restore(self) -> bool:
+        """Restore the last-known state from the store, False if there is none."""
+        if (cached := await self._store.async_load()) is None:
+            return False
+        self.basic_info = cached.get("basic_info")
+        self.model_info = cached.get("model_info")
+        if hour := cached.get("hour"):
+            self.hourly.restore(hour)
+        if not (blocks := cached.get("blocks")):
+            return False
+        self.data = DaikinDeviceState.from_blocks(**blocks, stale=frozenset(blocks))
+        return True
+
+    @callback
+    def _cache_data(self) -> dict[str, Any]:
+        """Return the data to save to the store."""
+        return {
+            "blocks": None
+            if self.data is None
+            else {
+                "control": self.data.control,
+                "sensors": self.data.sensors,
+                "status": self.data.status,
+            },
+            "basic_info": self.basic_info,
+            "model_info": self.model_info,
+            "hour": self.hourly.as_dict(),
+        }
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Wake only the listeners subscribed to fields that changed."""
+        previous, self._notified = self._notified, self.data
+        success_changed = self._notified_success != self.last_update_success
+        self._notified_success = self.last_update_success
+        if previous is None or self.data is None or success_changed:
+            # Availability or the first snapshot concerns every entity
+            super().async_update_listeners()
+            return
+
+        changed = self.data.changed_keys(previous)
+        if not changed:
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not changed.isdisjoint(context):
+                update_callback()
+
+    @property
+    def unsupported(self) -> frozenset[str]:
+        """Return the blocks not polled because the device answers them 404."""
+        return frozenset(self._unsupported_until)
+
+    @callback
+    def _async_not_found(self, key: str) -> bool:
+        """Count a 404 answer of a block, True if it is no longer polled."""
+        count = self._not_found[key] = self._not_found.get(key, 0) + 1
+        # Without control data there is no device to show; keep trying
+        if key == "control" or count < UNSUPPORTED_STRIKES:
+            return False
+        del self._not_found[key]
+        self._unsupported_until[key] = monotonic() + UNSUPPORTED_RETRY
+        self.logger.info(
+            "%s answers %s requests with 404, not polling them for %s s",
+            self.config_entry.title,
+            key,
+            UNSUPPORTED_RETRY,
+        )
+        return True
+
+    @callback
+    def _async_retry_unsupported(self, now: float) -> None:
+        """Poll again the blocks given up on UNSUPPORTED_RETRY seconds ago."""
+        # In case the 404s came from a booting device or a proxy in between
+        for key, until in list(self._unsupported_until.items()):
+            if until <= now:
+                del self._unsupported_until[key]
+
+    @property
+    def profile(self) -> ModelProfile:
+        """
+        Return the capabilities of the device.
+
+        Those of its model, less the blocks the device turned out not to have
+        and the readings missing from its sensor block.
+        """
+        profile = model_profile(
+            None if self.model_info is None else self.model_info.get("model")
+        )
+        blocks = profile.blocks - self.unsupported
+        sensors = profile.sensors
+        # Not narrowed before the sensor block was ever read
+        if self.data is not None and self.data.sensors:
+            sensors = sensors & frozenset(self.data.sensors)
+        if blocks == profile.blocks and sensors == profile.sensors:
+            return profile
+        return replace(profile, blocks=blocks, sensors=sensors)
+
+    def _due_blocks(self, now: float, blocks: Iterable[str]) -> list[str]:
+        """Return the blocks whose polling interval has elapsed."""
+        return [
+            key
+            for key in blocks
+            if key not in self._fetched_at
+            or now - self._fetched_at[key]
+            >= self.intervals[key].total_seconds() - POLL_TOLERANCE
+        ]
+
+    async def _async_update_data(self) -> DaikinDeviceState:
         """Update data via library."""
+        start = monotonic()
         try:
-            client = self.config_entry.runtime_data.client
+            return await self._async_fetch_state()
+        finally:
+            self.update_duration.record(monotonic() - start)
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Wake the diagnostic listeners, and history ones after a new sample."""
+        keys = {DIAGNOSTICS_KEY, HISTORY_KEY} if self._sampled else {DIAGNOSTICS_KEY}
+        self._sampled = False
+        self._async_wake(keys)
 
-            # Fetch all needed data in parallel would be better, but for now sequential
-            control_info = await client.async_get_control_info()
-            sensor_info = await client.async_get_sensor_info()
-            unit_status = await client.async_get_unit_status()
+    @callback
+    def _async_wake(self, keys: set[str]) -> None:
+        """Wake the listeners subscribed to any of the keys."""
+        for update_callback, context in list(self._listeners.values()):
+            if context is not None and not keys.isdisjoint(context):
+                update_callback()
 
-            return {
-                "control": control_info,
-                "sensors": sensor_info,
-                "status": unit_status,
+    async def _async_fetch_device_info(self) -> None:
+        """Fetch the basic and model info missing from the store."""
+        client = self.config_entry.runtime_data.client
+        fetchers = {
+            key: fetch
+            for key, fetch in (
+                ("basic_info", client.async_get_basic_info),
+                ("model_info", client.async_get_model_info),
+            )
+            if getattr(self, key) is None and key not in self._info_attempted
+        }
+        if not fetchers:
+            return
+        # Only asked for once per run, so a unit that lacks an endpoint is not
+        # sent failing requests on every poll
+        self._info_attempted.update(fetchers)
+        results = await asyncio.gather(
+            *(fetch() for fetch in fetchers.values()),
+            return_exceptions=True,
+        )
+        for key, result in zip(fetchers, results, strict=True):
+            if isinstance(result, dict):
+                setattr(self, key, result)
+            else:
+                self.logger.debug("Could not fetch %s: %s", key, result)
+
+    async def _async_fetch_state(self) -> DaikinDeviceState:
+        """Fetch the due blocks and decode the new snapshot."""
+        client = self.config_entry.runtime_data.client
+        fetchers: dict[str, Callable[[], Awaitable[dict[str, str]]]] = {
+            "control": client.async_get_control_info,
+            "sensors": client.async_get_sensor_info,
+            "status": client.async_get_unit_status,
+        }
+        await self._async_fetch_device_info()
+        now = monotonic()
+        self._async_retry_unsupported(now)
+        # Poll only what the model supports, before knowing it everything
+        fetchers = {key: fetchers[key] for key in self.profile.blocks}
+        due = self._due_blocks(now, fetchers)
+
+        results = await asyncio.gather(
+            *(fetchers[key]() for key in due),
+            return_exceptions=True,
+        )
+
+        previous = (
+            {
+                "control": self.data.control,
+                "sensors": self.data.sensors,
+                "status": self.data.status,
             }
-        except DaikinApiClientAuthenticationError as exception:
-            raise ConfigEntryAuthFailed(exception) from exception
-        except DaikinApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+            if self.data is not None
+            else {}
+        )
+        data = {key: previous[key] for key in fetchers if key not in due}
+        # Failed blocks are never marked fetched, so they are due again on the
+        # next tick and only blocks fetched this round can be stale.
+        stale: set[str] = set()
+        for key, result in zip(due, results, strict=True):
+            if isinstance(result, DaikinApiClientAuthenticationError):
+                raise ConfigEntryAuthFailed(result) from result
+            if not isinstance(result, DaikinApiClientNotSupportedError):
+                self._not_found.pop(key, None)
+            elif self._async_not_found(key):
+                continue
+            if isinstance(result, DaikinApiClientError):
+                # Keep the last good block if there is one, so a single slow
+                # endpoint does not take every entity of the device down. An
+                # optional block answered with a 404 can do without one.
+                if key not in previous and (
+                    key == "control"
+                    or not isinstance(result, DaikinApiClientNotSupportedError)
+                ):
+                    raise UpdateFailed(result) from result
+                self.logger.debug("Keeping stale %s data: %s", key, result)
+                data[key] = previous.get(key, {})
+                stale.add(key)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                data[key] = result
+                self._fetched_at[key] = now
+
+        answered = any(
+            isinstance(result, DaikinApiClientNotSupportedError) for result in results
+        )
+        if due and not answered and all(key in stale for key in due):
+            # Nothing answered, the device itself is unreachable.
+            if not client.available:
+                # Given up on by the breaker; it may have moved to another
+                # address, look for it by its MAC
+                async_get_relocator(self.hass).async_locate(self.config_entry)
+            raise UpdateFailed(results[0]) from results[0]
+
+        # Blocks the model does not support stay empty
+        state = DaikinDeviceState.from_blocks(
+            control=data.get("control", {}),
+            sensors=data.get("sensors", {}),
+            status=data.get("status", {}),
+            stale=frozenset(stale),
+        )
+        if "sensors" in due and "sensors" not in stale:
+            sample = {key: getattr(state, key) for key in HISTORY_KEYS}
+            self.history.add(now, sample)
+            self._sampled = True
+            if self.long_term_statistics and (hour := self.hourly.add(time(), sample)):
+                async_add_hour(self.hass, self.config_entry, *hour)
+        self._store.async_delay_save(self._cache_data, STORAGE_SAVE_DELAY)
+        return state
+
+    async def async_set_control(  # noqa: PLR0913
+        self,
+        *,
+        power: str | None = None,
+        mode: str | None = None,
+        humidity: str | None = None,
+        fan_speed: str | None = None,
+        confirm: bool = True,
+        force: bool = False,
+    ) -> ControlWrite:
+        """
+        Write control parameters and update entities optimistically.
+
+        Only the parameters that differ from the known control state are sent,
+        and nothing at all, not even a refresh, when none does; force sends
+        them all. Once the device acknowledges the write, the sent values are
+        merged into the control block, if there is one yet, and pushed to the
+        entities right away; a single confirmation poll follows after
+        CONTROL_CONFIRM_DELAY unless confirm is False, for callers that
+        schedule the refresh themselves.
+        Return whether the write was acknowledged, rejected or skipped.
+        """
+        params = build_control_params(
+            power=power,
+            mode=mode,
+            humidity=humidity,
+            fan_speed=fan_speed,
+        )
+        if not force:
+            params = self.async_control_changes(params)
+            if not params:
+                self.writes_skipped += 1
+                self.logger.debug("Control state already as requested, not writing")
+                return ControlWrite.SKIPPED
+        client = self.config_entry.runtime_data.client
+        response = await client.async_write_control(params)
+
+        if response.get("ret") != "OK":
+            self.logger.debug("Control write not acknowledged: %s", response)
+            self.async_expire("control")
+            if confirm:
+                await self.async_request_refresh()
+            return ControlWrite.REJECTED
+
+        if self.data is not None:
+            # Without a control state to merge into, the confirmation poll
+            # brings the written values in
+            self.async_set_updated_data(self.data.with_control(params))
+        if self._confirm_unsub is not None:
+            self._confirm_unsub()
+            self._confirm_unsub = None
+        if confirm:
+            self._confirm_unsub = async_call_later(
+                self.hass, CONTROL_CONFIRM_DELAY, self._async_confirm_control
+            )
+        return ControlWrite.ACKNOWLEDGED
+
+    @callback
+    def async_control_changes(self, params: dict[str, str]) -> dict[str, str]:
+        """
+        Return the control parameters that would change the device's state.
+
+        They are compared with the control state the device polled as or
+        acknowledged. A parameter that a write still on its way to the device
+        also sets is always returned, since that write may yet fail or set
+        another value. While the state is unknown or stale every parameter is
+        returned.
+        """
+        if self.data is None or "control" in self.data.stale:
+            return params
+        pending = self.config_entry.runtime_data.client.pending_control
+        return {
+            key: value
+            for key, value in params.items()
+            if key in pending or self.data.control.get(key) != value
+        }
+
+    @callback
+    def async_expire(self, key: str) -> None:
+        """Make a block due on the next refresh, whatever its interval."""
+        self._fetched_at.pop(key, None)
+
+    async def _async_confirm_control(self, _now: datetime) -> None:
+        """Poll the device to confirm the optimistic control state."""
+        self._confirm_unsub = None
+        self.async_expire("control")
+        await self.async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the pending confirmation poll, save the state and shut down."""
+        if self._confirm_unsub is not None:
+            self._confirm_unsub()
+            self._confirm_unsub = None
+        await super().async_shutdown()
+        if self.data is not None:
+            # Written now rather than by the delayed save, which would bring
+            # the file back after async_remove_entry deleted it
+            await self._store.async_save(self._cache_data())
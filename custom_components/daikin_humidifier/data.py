@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Self
+
+from .const import FILTER_SIGN_ON, POWER_ON
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -23,3 +25,142 @@ class DaikinData:
     client: DaikinApiClient
     coordinator: DaikinDataUpdateCoordinator
     integration: Integration
+
+
+def _to_int(value: str | None) -> int | None:
+    """Decode an integer field, None if missing or malformed."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _to_float(value: str | None) -> float | None:
+    """Decode a float field, None if missing or malformed."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
+class DaikinDeviceState:
+    """
+    Decoded snapshot of a device, built once per refresh.
+
+    Control values keep the device codes (see const.py) so entities can map
+    them with a single dict lookup. The raw blocks are kept for partial
+    updates but do not take part in comparisons.
+    """
+
+    power: bool | None
+    mode: str | None
+    humidity_level: str | None
+    fan_speed: str | None
+    pm25: int | None
+    hhum: int | None
+    htemp: float | None
+    filter_sign: bool | None
+    control: dict[str, str] = field(compare=False, repr=False)
+    sensors: dict[str, str] = field(compare=False, repr=False)
+    status: dict[str, str] = field(compare=False, repr=False)
+    # Blocks not refreshed by the last poll; compared, so a block turning
+    # stale or fresh is an update even when its values stay the same
+    stale: frozenset[str] = field(default=frozenset())
+
+    @classmethod
+    def from_blocks(
+        cls,
+        control: dict[str, str],
+        sensors: dict[str, str],
+        status: dict[str, str],
+        stale: frozenset[str] = frozenset(),
+    ) -> Self:
+        """Decode the parsed control, sensor and unit-status responses."""
+        power = control.get("pow")
+        filter_sign = status.get("filter_sign")
+        return cls(
+            power=None if power is None else power == POWER_ON,
+            mode=control.get("mode"),
+            humidity_level=control.get("humd"),
+            fan_speed=control.get("airvol"),
+            pm25=_to_int(sensors.get("pm25")),
+            hhum=_to_int(sensors.get("hhum")),
+            htemp=_to_float(sensors.get("htemp")),
+            filter_sign=None if filter_sign is None else filter_sign == FILTER_SIGN_ON,
+            control=control,
+            sensors=sensors,
+            status=status,
+            stale=stale,
+        )
+
+    def changed_keys(self, other: DaikinDeviceState) -> frozenset[str]:
+        """Return the decoded fields that differ, or went stale or fresh."""
+        restaled = self.stale ^ other.stale
+        return frozenset(
+            key
+            for key in STATE_KEYS
+            if getattr(self, key) != getattr(other, key)
+            or FIELD_BLOCKS[key] in restaled
+        )
+
+    def with_control(self, params: dict[str, str]) -> Self:
+        """Return a copy with control parameters merged in."""
+        return self.from_blocks(
+            {**self.control, **params}, self.sensors, self.status, self.stale
+        )
+
+
+# Decoded fields entities can subscribe to
+STATE_KEYS = tuple(
+    item.name
+    for item in fields(DaikinDeviceState)
+    if item.compare and item.name != "stale"
+)
+
+# Block each decoded field is read from
+FIELD_BLOCKS = {
+    "power": "control",
+    "mode": "control",
+    "humidity_level": "control",
+    "fan_speed": "control",
+    "pm25": "sensors",
+    "hhum": "sensors",
+    "htemp": "sensors",
+    "filter_sign": "status",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ReportPolicy:
+    """
+    When a sensor writes a new reading to its state.
+
+    A reading is significant when it moves more than the absolute deadband,
+    or more than the relative one (a fraction of the last written reading),
+    from the last written reading; with both deadbands 0 any change is.
+    Significant readings are written no sooner than min_interval seconds
+    after the previous write; others once max_interval seconds have passed,
+    unless max_interval is 0.
+    """
+
+    absolute: float = 0.0
+    relative: float = 0.0
+    min_interval: float = 0.0
+    max_interval: float = 0.0
+
+    def significant(self, written: float | None, value: float | None) -> bool:
+        """Return whether value differs enough from the written reading."""
+        if written is None or value is None:
+            return written != value
+        change = abs(value - written)
+        if not self.absolute and not self.relative:
+            return change > 0
+        return bool(
+            (self.absolute and change > self.absolute)
+            or (self.relative and change > self.relative * abs(written))
+        )
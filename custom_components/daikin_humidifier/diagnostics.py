@@ -0,0 +1,69 @@
+"""Diagnostics support for Daikin Humidifier."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import DaikinConfigEntry
+
+TO_REDACT = {CONF_HOST, "unique_id", "title", "mac", "name", "ssid"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    entry: DaikinConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    client = entry.runtime_data.client
+    coordinator = entry.runtime_data.coordinator
+    breaker = client.breaker
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "device": async_redact_data(
+            {
+                "basic_info": coordinator.basic_info,
+                "model_info": coordinator.model_info,
+                "profile": {
+                    "blocks": sorted(coordinator.profile.blocks),
+                    "sensors": sorted(coordinator.profile.sensors),
+                    "humidify": coordinator.profile.humidify,
+                },
+            },
+            TO_REDACT,
+        ),
+        "polling": {
+            "intervals": {
+                key: interval.total_seconds()
+                for key, interval in coordinator.intervals.items()
+            },
+            "last_update_success": coordinator.last_update_success,
+            "update_duration": coordinator.update_duration.as_dict(),
+            "poll_lag": coordinator.poll_lag,
+            "writes_skipped": coordinator.writes_skipped,
+        },
+        "breaker": {
+            "state": breaker.state,
+            "failures": breaker.failures,
+            "backoff": breaker.backoff,
+            "retry_in": breaker.retry_in,
+        },
+        "endpoints": {
+            endpoint: stats.as_dict() for endpoint, stats in client.stats.items()
+        },
+        "history": {
+            "window": coordinator.history_window,
+            "samples": len(coordinator.history),
+            "capacity": coordinator.history.capacity,
+        },
+        "state": None
+        if coordinator.data is None
+        else {**asdict(coordinator.data), "stale": sorted(coordinator.data.stale)},
+    }
@@ -0,0 +1,118 @@
+"""LAN discovery of Daikin Humidifier units."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from ipaddress import IPv4Address, IPv4Network, ip_interface
+from typing import TYPE_CHECKING
+from urllib.parse import unquote
+
+import aiohttp
+from homeassistant.components import network
+
+from .api import _parse_response
+from .const import (
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_MIN_PREFIX,
+    DISCOVERY_TIMEOUT,
+    ENDPOINT_BASIC_INFO,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.core import HomeAssistant
+
+
+@dataclass(frozen=True)
+class DiscoveredDevice:
+    """A unit that answered the discovery probe."""
+
+    host: str
+    mac: str
+    name: str
+
+
+def device_name(info: dict[str, str], default: str) -> str:
+    """Return the readable name from basic_info, which is percent-encoded."""
+    name = info.get("name")
+    return unquote(name) if name else default
+
+
+async def async_get_scan_networks(hass: HomeAssistant) -> list[IPv4Network]:
+    """
+    Return the IPv4 networks of the enabled adapters.
+
+    Networks wider than DISCOVERY_MIN_PREFIX are narrowed to the block of that
+    size around the host's own address, to keep a scan to a few seconds.
+    """
+    networks: list[IPv4Network] = []
+    for adapter in await network.async_get_adapters(hass):
+        if not adapter["enabled"]:
+            continue
+        for address in adapter["ipv4"]:
+            interface = ip_interface(
+                f"{address['address']}/"
+                f"{max(address['network_prefix'], DISCOVERY_MIN_PREFIX)}"
+            )
+            if interface.ip.is_loopback or interface.ip.is_link_local:
+                continue
+            if interface.network not in networks:
+                networks.append(interface.network)
+    return networks
+
+
+async def async_probe(
+    session: aiohttp.ClientSession,
+    host: str,
+    timeout: float = DISCOVERY_TIMEOUT,  # noqa: ASYNC109
+) -> DiscoveredDevice | None:
+    """Return the unit at host, or None if nothing Daikin-like answers."""
+    try:
+        async with session.get(
+            f"http://{host}{ENDPOINT_BASIC_INFO}",
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            allow_redirects=False,
+        ) as response:
+            if response.status != 200:  # noqa: PLR2004
+                return None
+            info = _parse_response(await response.text())
+    except (TimeoutError, aiohttp.ClientError, UnicodeDecodeError, ValueError):
+        return None
+    if info.get("ret") != "OK" or "mac" not in info:
+        return None
+    return DiscoveredDevice(host=host, mac=info["mac"], name=device_name(info, host))
+
+
+async def async_scan(
+    session: aiohttp.ClientSession,
+    networks: Iterable[IPv4Network],
+    *,
+    concurrency: int = DISCOVERY_CONCURRENCY,
+    timeout: float = DISCOVERY_TIMEOUT,  # noqa: ASYNC109
+) -> list[DiscoveredDevice]:
+    """
+    Probe every address of the networks concurrently.
+
+    Args:
+        session: aiohttp client session
+        networks: Networks whose host addresses are probed
+        concurrency: Probes in flight at once
+        timeout: Seconds each probe may take
+
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    hosts: dict[IPv4Address, None] = {}
+    for subnet in networks:
+        hosts.update(dict.fromkeys(subnet.hosts()))
+
+    async def _async_probe(host: IPv4Address) -> DiscoveredDevice | None:
+        async with semaphore:
+            return await async_probe(session, str(host), timeout)
+
+    results = await asyncio.gather(*(_async_probe(host) for host in hosts))
+    found = {device.mac: device for device in results if device is not None}
+    LOGGER.debug("Probed %s addresses, found %s units", len(hosts), len(found))
+    return sorted(found.values(), key=lambda device: device.name)
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import ATTR_STALE, DOMAIN
 from .coordinator import DaikinDataUpdateCoordinator
+from .data import FIELD_BLOCKS
 
 
 class DaikinEntity(CoordinatorEntity[DaikinDataUpdateCoordinator]):
@@ -14,13 +17,53 @@ class DaikinEntity(CoordinatorEntity[DaikinDataUpdateCoordinator]):
 
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator: DaikinDataUpdateCoordinator) -> None:
-        """Initialize Daikin Entity."""
-        super().__init__(coordinator)
+    def __init__(
+        self,
+        coordinator: DaikinDataUpdateCoordinator,
+        context: frozenset[str] | None = None,
+    ) -> None:
+        """
+        Initialize Daikin Entity.
+
+        Args:
+            coordinator: Coordinator of the device
+            context: DaikinDeviceState fields the entity shows; it is only
+                woken when one of them changes (None for every update)
+
+        """
+        super().__init__(coordinator, context)
+        # Blocks of the device state the entity shows
+        self._blocks = frozenset(
+            FIELD_BLOCKS[key] for key in context or () if key in FIELD_BLOCKS
+        )
 
         # Get device info from config entry or coordinator data
+        basic_info = coordinator.basic_info or {}
+        model_info = coordinator.model_info or {}
+        version = basic_info.get("ver")
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
             name=coordinator.config_entry.title,
             manufacturer="Daikin",
+            model=model_info.get("model"),
+            sw_version=None if version is None else version.replace("_", "."),
         )
+
+    @property
+    def available(self) -> bool:
+        """Return False as soon as the device stops answering."""
+        return (
+            super().available
+            and self.coordinator.config_entry.runtime_data.client.available
+        )
+
+    @property
+    def stale(self) -> bool:
+        """Return True while the state shown was not refreshed from the device."""
+        data = self.coordinator.data
+        return data is not None and not data.stale.isdisjoint(self._blocks)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag a state restored from the cache or kept after a failed poll."""
+        return {ATTR_STALE: True} if self.stale else None
@@ -49,20 +49,18 @@ class DaikinFan(DaikinEntity, FanEntity):
 
     def __init__(self, coordinator: DaikinDataUpdateCoordinator) -> None:
         """Initialize the fan."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({"power", "fan_speed"}))
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}_fan"
 
     @property
     def is_on(self) -> bool:
         """Return True if fan is on."""
-        control = self.coordinator.data.get("control", {})
-        return control.get("pow") == POWER_ON
+        return self.coordinator.data.power is True
 
     @property
     def percentage(self) -> int | None:
         """Return the current speed percentage."""
-        control = self.coordinator.data.get("control", {})
-        fan_value = control.get("airvol")
+        fan_value = self.coordinator.data.fan_speed
 
         # If in auto mode, return None (preset mode)
         if fan_value == FAN_AUTO:
@@ -76,10 +74,7 @@ class DaikinFan(DaikinEntity, FanEntity):
     @property
     def preset_mode(self) -> str | None:
         """Return the current preset mode."""
-        control = self.coordinator.data.get("control", {})
-        fan_value = control.get("airvol")
-
-        if fan_value == FAN_AUTO:
+        if self.coordinator.data.fan_speed == FAN_AUTO:
             return "auto"
         return None
 
@@ -99,23 +94,11 @@ class DaikinFan(DaikinEntity, FanEntity):
             )
             fan_speed = FAN_REVERSE.get(fan_mode)
 
-        if fan_speed:
-            client = self.coordinator.config_entry.runtime_data.client
-            await client.async_set_control_info(
-                power=POWER_ON,
-                fan_speed=fan_speed,
-            )
-        else:
-            client = self.coordinator.config_entry.runtime_data.client
-            await client.async_set_control_info(power=POWER_ON)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_control(power=POWER_ON, fan_speed=fan_speed)
 
     async def async_turn_off(self) -> None:
         """Turn off the fan."""
-        await self.coordinator.config_entry.runtime_data.client.async_set_control_info(
-            power=POWER_OFF
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_control(power=POWER_OFF)
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage."""
@@ -123,13 +106,9 @@ class DaikinFan(DaikinEntity, FanEntity):
         fan_speed = FAN_REVERSE.get(fan_mode)
 
         if fan_speed:
-            client = self.coordinator.config_entry.runtime_data.client
-            await client.async_set_control_info(fan_speed=fan_speed)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_control(fan_speed=fan_speed)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode."""
         if preset_mode == "auto":
-            client = self.coordinator.config_entry.runtime_data.client
-            await client.async_set_control_info(fan_speed=FAN_AUTO)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_control(fan_speed=FAN_AUTO)
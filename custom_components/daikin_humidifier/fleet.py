@@ -0,0 +1,175 @@
+"""Fleet-wide poll scheduler for Daikin Humidifier."""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, FLEET_JITTER, FLEET_MAX_IN_FLIGHT, REFRESH_WAVE_SPREAD
+from .scheduler import DaikinRequestScheduler
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Iterable
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .coordinator import DaikinDataUpdateCoordinator
+
+DATA_FLEET: HassKey[DaikinFleetScheduler] = HassKey(f"{DOMAIN}_fleet")
+
+# Fractional part of the golden ratio; multiples of it spread any number of
+# devices evenly over the interval without reshuffling earlier ones.
+_GOLDEN_FRACTION = 0.6180339887498949
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> DaikinFleetScheduler:
+    """Return the fleet scheduler shared by all config entries."""
+    if (fleet := hass.data.get(DATA_FLEET)) is None:
+        fleet = hass.data[DATA_FLEET] = DaikinFleetScheduler(hass)
+    return fleet
+
+
+class _FleetDevice:
+    """Poll slot of one device."""
+
+    __slots__ = ("coordinator", "due", "handle", "phase", "task")
+
+    def __init__(
+        self, coordinator: DaikinDataUpdateCoordinator, phase: float, due: float
+    ) -> None:
+        """Initialize the slot."""
+        self.coordinator = coordinator
+        # Offset of the slot within the poll interval, as a fraction of it
+        self.phase = phase
+        self.due = due
+        self.handle: asyncio.TimerHandle | None = None
+        self.task: asyncio.Task[None] | None = None
+
+
+class DaikinFleetScheduler:
+    """
+    Drive the polls of every Daikin device from one place.
+
+    Each device gets a fixed phase within its poll interval so polls are
+    spread evenly instead of firing in a burst, and all clients share one
+    request scheduler that caps the requests in flight across the fleet and
+    lets writes through before polls. The delay
+    between a device's slot and the actual start of its poll is stored as
+    the coordinator's poll_lag.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.limiter = DaikinRequestScheduler(FLEET_MAX_IN_FLIGHT)
+        self._devices: dict[str, _FleetDevice] = {}
+        self._slots = 0
+
+    @callback
+    def async_register(self, coordinator: DaikinDataUpdateCoordinator) -> CALLBACK_TYPE:
+        """Start polling a device in its own slot; return a callback to stop."""
+        interval = coordinator.poll_interval.total_seconds()
+        phase = (self._slots * _GOLDEN_FRACTION) % 1
+        jitter = random.uniform(0, FLEET_JITTER)  # noqa: S311
+        self._slots += 1
+
+        entry_id = coordinator.config_entry.entry_id
+        device = _FleetDevice(
+            coordinator,
+            phase + jitter,
+            self.hass.loop.time() + (phase + jitter) * interval,
+        )
+        self._devices[entry_id] = device
+        self._schedule(device)
+
+        @callback
+        def _unregister() -> None:
+            if device.handle is not None:
+                device.handle.cancel()
+            if device.task is not None:
+                device.task.cancel()
+            self._devices.pop(entry_id, None)
+
+        return _unregister
+
+    @callback
+    def async_reschedule(self, coordinator: DaikinDataUpdateCoordinator) -> None:
+        """Move a device's next slot after its poll interval changed."""
+        if (device := self._devices.get(coordinator.config_entry.entry_id)) is None:
+            return
+        interval = coordinator.poll_interval.total_seconds()
+        if device.handle is not None:
+            device.handle.cancel()
+        # Same phase within the new interval, so the spread is kept
+        device.due = self.hass.loop.time() + device.phase * interval
+        self._schedule(device)
+
+    @callback
+    def _schedule(self, device: _FleetDevice) -> None:
+        """Arm the timer for the device's next slot."""
+        device.handle = self.hass.loop.call_at(device.due, self._poll, device)
+
+    @callback
+    def _poll(self, device: _FleetDevice) -> None:
+        """Start the poll of a device whose slot has come."""
+        coordinator = device.coordinator
+        now = self.hass.loop.time()
+        interval = coordinator.poll_interval.total_seconds()
+        coordinator.poll_lag = now - device.due
+
+        # Keep a fixed rate; slots missed while a slow poll was running are
+        # skipped rather than fired back to back.
+        device.due += interval
+        if device.due <= now:
+            device.due += interval * ((now - device.due) // interval + 1)
+        self._schedule(device)
+        self._refresh(device)
+
+    @callback
+    def async_refresh_wave(
+        self,
+        coordinators: Iterable[DaikinDataUpdateCoordinator],
+        delay: float,
+        spread: float = REFRESH_WAVE_SPREAD,
+    ) -> None:
+        """
+        Refresh the control state of several devices in one staggered wave.
+
+        Args:
+            coordinators: Coordinators of the devices to refresh
+            delay: Seconds before the first refresh
+            spread: Seconds over which the refreshes are spaced evenly
+
+        """
+        devices = [
+            device
+            for coordinator in coordinators
+            if (device := self._devices.get(coordinator.config_entry.entry_id))
+        ]
+        start = self.hass.loop.time() + delay
+        for index, device in enumerate(devices):
+            device.coordinator.async_expire("control")
+            self.hass.loop.call_at(
+                start + spread * index / len(devices), self._refresh, device
+            )
+
+    @callback
+    def _refresh(self, device: _FleetDevice) -> None:
+        """Refresh a device unless its previous poll is still running."""
+        coordinator = device.coordinator
+        if self._devices.get(coordinator.config_entry.entry_id) is not device:
+            # Unregistered since the refresh was scheduled
+            return
+        if device.task is not None and not device.task.done():
+            coordinator.logger.debug("Previous poll still running, skipping")
+            return
+        device.task = coordinator.config_entry.async_create_background_task(
+            self.hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN} poll {coordinator.config_entry.title}",
+        )
@@ -0,0 +1,234 @@
+"""In-memory sensor history for Daikin Humidifier."""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from math import isnan, nan
+from typing import Any
+
+
+class _WindowAggregate:
+    """Running aggregates of one key over one time window."""
+
+    __slots__ = ("count", "maxima", "minima", "sum", "sum_t", "sum_tt", "sum_tv")
+
+    def __init__(self) -> None:
+        """Initialize empty aggregates."""
+        self.count = 0
+        self.sum = 0.0
+        self.sum_t = 0.0
+        self.sum_tt = 0.0
+        self.sum_tv = 0.0
+        # Sample numbers of candidate minima/maxima, values monotonic
+        self.minima: deque[int] = deque()
+        self.maxima: deque[int] = deque()
+
+    def add(self, seq: int, t: float, value: float, values: array) -> None:
+        """Add the sample with number seq."""
+        self.count += 1
+        self.sum += value
+        self.sum_t += t
+        self.sum_tt += t * t
+        self.sum_tv += t * value
+        capacity = len(values)
+        while self.minima and values[self.minima[-1] % capacity] >= value:
+            self.minima.pop()
+        self.minima.append(seq)
+        while self.maxima and values[self.maxima[-1] % capacity] <= value:
+            self.maxima.pop()
+        self.maxima.append(seq)
+
+    def remove(self, seq: int, t: float, value: float) -> None:
+        """Remove the sample with number seq, the oldest in the window."""
+        self.count -= 1
+        if not self.count:
+            # Start over exactly instead of carrying rounding errors
+            self.sum = self.sum_t = self.sum_tt = self.sum_tv = 0.0
+        else:
+            self.sum -= value
+            self.sum_t -= t
+            self.sum_tt -= t * t
+            self.sum_tv -= t * value
+        if self.minima and self.minima[0] == seq:
+            self.minima.popleft()
+        if self.maxima and self.maxima[0] == seq:
+            self.maxima.popleft()
+
+
+class SampleHistory:
+    """
+    Fixed-size ring buffer of sensor samples with rolling statistics.
+
+    Samples are stored in preallocated arrays, one for the timestamps and one
+    per key, so memory is bounded by the capacity. For every configured window
+    the running sums and monotonic min/max queues are updated as samples
+    enter and leave it, which makes mean, min, max and the least-squares
+    trend O(1) to read and amortized O(1) to maintain. A sample that is
+    overwritten because the buffer is full also leaves every window.
+    """
+
+    def __init__(
+        self,
+        keys: tuple[str, ...],
+        windows: tuple[float, ...],
+        capacity: int,
+    ) -> None:
+        """
+        Initialize an empty history.
+
+        Args:
+            keys: Names of the values stored with each sample
+            windows: Window lengths in seconds
+            capacity: Number of samples kept in the ring buffer
+
+        """
+        self.keys = keys
+        self.windows = windows
+        self.capacity = capacity
+        self._times = array("d", [0.0]) * capacity
+        self._values = {key: array("d", [nan]) * capacity for key in keys}
+        # Number of samples ever added; sample seq lives at seq % capacity
+        self._count = 0
+        # Timestamps are stored relative to the first sample to keep the
+        # regression sums well conditioned.
+        self._origin: float | None = None
+        self._start = dict.fromkeys(windows, 0)
+        self._aggregates = {
+            window: {key: _WindowAggregate() for key in keys} for window in windows
+        }
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return min(self._count, self.capacity)
+
+    def add(self, timestamp: float, values: dict[str, float | None]) -> None:
+        """Add a sample; keys missing or None are skipped by the statistics."""
+        if self._origin is None:
+            self._origin = timestamp
+        t = timestamp - self._origin
+        seq = self._count
+        # The sample about to be overwritten leaves every window first
+        oldest = seq - self.capacity + 1
+
+        index = seq % self.capacity
+        for window in self.windows:
+            self._evict(window, t - window, oldest)
+        self._times[index] = t
+        for key, column in self._values.items():
+            value = values.get(key)
+            column[index] = nan if value is None else value
+            if value is not None:
+                for aggregates in self._aggregates.values():
+                    aggregates[key].add(seq, t, value, column)
+        self._count += 1
+
+    def _evict(self, window: float, cutoff: float, oldest: int) -> None:
+        """Drop samples of a window older than cutoff or numbered below oldest."""
+        start = self._start[window]
+        aggregates = self._aggregates[window]
+        while start < self._count:
+            index = start % self.capacity
+            t = self._times[index]
+            if start >= oldest and t >= cutoff:
+                break
+            for key, column in self._values.items():
+                value = column[index]
+                if not isnan(value):
+                    aggregates[key].remove(start, t, value)
+            start += 1
+        self._start[window] = start
+
+    def mean(self, key: str, window: float) -> float | None:
+        """Return the mean of a key over a window."""
+        aggregate = self._aggregates[window][key]
+        return aggregate.sum / aggregate.count if aggregate.count else None
+
+    def minimum(self, key: str, window: float) -> float | None:
+        """Return the minimum of a key over a window."""
+        minima = self._aggregates[window][key].minima
+        return self._values[key][minima[0] % self.capacity] if minima else None
+
+    def maximum(self, key: str, window: float) -> float | None:
+        """Return the maximum of a key over a window."""
+        maxima = self._aggregates[window][key].maxima
+        return self._values[key][maxima[0] % self.capacity] if maxima else None
+
+    def slope(self, key: str, window: float) -> float | None:
+        """Return the least-squares trend of a key in units per second."""
+        aggregate = self._aggregates[window][key]
+        n = aggregate.count
+        denominator = n * aggregate.sum_tt - aggregate.sum_t * aggregate.sum_t
+        if n < 2 or denominator <= 0:  # noqa: PLR2004
+            return None
+        return (n * aggregate.sum_tv - aggregate.sum_t * aggregate.sum) / denominator
+
+
+class HourlyAggregate:
+    """
+    Mean, minimum and maximum of sensor samples over one clock hour.
+
+    Samples are added with their wall-clock timestamp. The first sample of a
+    later hour closes the current one, which is returned so it can be written
+    as long-term statistics; only a few numbers per key are kept meanwhile.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty aggregate."""
+        # Start of the open hour (epoch seconds), None before the first sample
+        self.start: float | None = None
+        # Count, sum, minimum and maximum of each key over the open hour
+        self._buckets: dict[str, list[float]] = {}
+
+    def add(
+        self, timestamp: float, values: dict[str, float | None]
+    ) -> tuple[float, dict[str, tuple[float, float, float]]] | None:
+        """
+        Add a sample, returning the hour it closed if it started a new one.
+
+        Returns:
+            The start of the closed hour and, for each key, its mean,
+            minimum and maximum; None if the sample is in the open hour
+
+        """
+        start = timestamp - timestamp % 3600
+        closed = None
+        if start != self.start:
+            closed = self.close()
+            self.start = start
+        for key, value in values.items():
+            if value is None:
+                continue
+            if (bucket := self._buckets.get(key)) is None:
+                self._buckets[key] = [1, value, value, value]
+                continue
+            bucket[0] += 1
+            bucket[1] += value
+            bucket[2] = min(bucket[2], value)
+            bucket[3] = max(bucket[3], value)
+        return closed
+
+    def current(self) -> tuple[float, dict[str, tuple[float, float, float]]] | None:
+        """Return the open hour so far, keeping it open; None if it is empty."""
+        if self.start is None or not self._buckets:
+            return None
+        return self.start, {
+            key: (total / count, minimum, maximum)
+            for key, (count, total, minimum, maximum) in self._buckets.items()
+        }
+
+    def close(self) -> tuple[float, dict[str, tuple[float, float, float]]] | None:
+        """Close the open hour and return it, None if it has no samples."""
+        hour = self.current()
+        self.start = None
+        self._buckets = {}
+        return hour
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the open hour in a form that can be stored as JSON."""
+        return {"start": self.start, "buckets": self._buckets}
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Reopen an hour saved with as_dict."""
+        self.start = data["start"]
+        self._buckets = {key: list(bucket) for key, bucket in data["buckets"].items()}
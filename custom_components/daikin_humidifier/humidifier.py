@@ -15,6 +15,8 @@ from .const import (
     HUMIDITY_LOW,
     HUMIDITY_NORMAL,
     HUMIDITY_OFF,
+    HUMIDITY_TARGETS,
+    MODE_MOISTURIZE,
     MODE_REVERSE,
     MODES,
     POWER_OFF,
@@ -50,67 +52,48 @@ class DaikinHumidifier(DaikinEntity, HumidifierEntity):
 
     def __init__(self, coordinator: DaikinDataUpdateCoordinator) -> None:
         """Initialize the humidifier."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator, frozenset({"power", "mode", "humidity_level", "hhum"})
+        )
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}_humidifier"
 
     @property
     def is_on(self) -> bool:
         """Return True if device is on."""
-        control = self.coordinator.data.get("control", {})
-        return control.get("pow") == POWER_ON
+        return self.coordinator.data.power is True
 
     @property
     def mode(self) -> str | None:
         """Return the current mode (operating mode of the device)."""
-        control = self.coordinator.data.get("control", {})
-        mode_value = control.get("mode")
-        return MODES.get(mode_value)
+        return MODES.get(self.coordinator.data.mode)
 
     @property
     def available_modes(self) -> list[str]:
         """Return available modes."""
-        return list(MODE_REVERSE.keys())
+        if self.coordinator.profile.humidify:
+            return list(MODE_REVERSE.keys())
+        return [name for code, name in MODES.items() if code != MODE_MOISTURIZE]
 
     @property
     def target_humidity(self) -> int | None:
         """Return the target humidity."""
-        control = self.coordinator.data.get("control", {})
-        humd_value = control.get("humd")
-
+        if not self.coordinator.profile.humidify:
+            return None
         # Map Daikin levels to percentages
-        humidity_map = {
-            HUMIDITY_OFF: 0,
-            HUMIDITY_LOW: 40,
-            HUMIDITY_NORMAL: 50,
-            HUMIDITY_HIGH: 60,
-        }
-        return humidity_map.get(humd_value, 50)
+        return HUMIDITY_TARGETS.get(self.coordinator.data.humidity_level, 50)
 
     @property
     def current_humidity(self) -> int | None:
         """Return the current humidity."""
-        sensors = self.coordinator.data.get("sensors", {})
-        humi = sensors.get("hhum")
-        if humi:
-            try:
-                return int(humi)
-            except (ValueError, TypeError):
-                return None
-        return None
+        return self.coordinator.data.hhum
 
     async def async_turn_on(self) -> None:
         """Turn the device on."""
-        await self.coordinator.config_entry.runtime_data.client.async_set_control_info(
-            power=POWER_ON
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_control(power=POWER_ON)
 
     async def async_turn_off(self) -> None:
         """Turn the device off."""
-        await self.coordinator.config_entry.runtime_data.client.async_set_control_info(
-            power=POWER_OFF
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_control(power=POWER_OFF)
 
     async def async_set_humidity(self, humidity: int) -> None:
         """Set new target humidity."""
@@ -125,14 +108,10 @@ class DaikinHumidifier(DaikinEntity, HumidifierEntity):
         else:
             humd_value = HUMIDITY_HIGH
 
-        client = self.coordinator.config_entry.runtime_data.client
-        await client.async_set_control_info(humidity=humd_value)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_control(humidity=humd_value)
 
     async def async_set_mode(self, mode: str) -> None:
         """Set new operating mode."""
         mode_value = MODE_REVERSE.get(mode)
         if mode_value:
-            client = self.coordinator.config_entry.runtime_data.client
-            await client.async_set_control_info(mode=mode_value)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_control(mode=mode_value)
@@ -0,0 +1,76 @@
+"""Long-term statistics of Daikin Humidifier sensor readings."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import (
+    CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+    PERCENTAGE,
+    UnitOfTemperature,
+)
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import DaikinConfigEntry
+
+# Name and unit of each reading written as statistics
+STATISTICS = {
+    "pm25": ("PM2.5", CONCENTRATION_MICROGRAMS_PER_CUBIC_METER),
+    "hhum": ("Humidity", PERCENTAGE),
+    "htemp": ("Temperature", UnitOfTemperature.CELSIUS),
+}
+
+
+def statistic_id(entry: DaikinConfigEntry, key: str) -> str:
+    """Return the external statistic id of a reading of an entry's device."""
+    return f"{DOMAIN}:{entry.entry_id.lower()}_{key}"
+
+
+@callback
+def async_add_hour(
+    hass: HomeAssistant,
+    entry: DaikinConfigEntry,
+    start: float,
+    hour: dict[str, tuple[float, float, float]],
+) -> None:
+    """
+    Write the mean, minimum and maximum of an hour as external statistics.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Entry of the device the readings come from
+        start: Start of the hour (epoch seconds)
+        hour: Mean, minimum and maximum of each reading over the hour
+
+    """
+    if "recorder" not in hass.config.components:
+        return
+    for key, (mean, minimum, maximum) in hour.items():
+        name, unit = STATISTICS[key]
+        async_add_external_statistics(
+            hass,
+            StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{entry.title} {name}",
+                source=DOMAIN,
+                statistic_id=statistic_id(entry, key),
+                unit_of_measurement=unit,
+            ),
+            [
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(start),
+                    mean=mean,
+                    min=minimum,
+                    max=maximum,
+                )
+            ],
+        )
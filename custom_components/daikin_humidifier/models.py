@@ -0,0 +1,51 @@
+"""Capabilities of the Daikin Humidifier model families."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+
+BLOCKS = frozenset({"control", "sensors", "status"})
+SENSORS = frozenset({"pm25", "hhum", "htemp"})
+
+
+@dataclass(frozen=True, slots=True)
+class ModelProfile:
+    """What a model family supports."""
+
+    # Blocks (endpoints) the unit answers and that are polled
+    blocks: frozenset[str] = BLOCKS
+    # Readings of the sensor block that the unit reports
+    sensors: frozenset[str] = SENSORS
+    # Whether the unit has a humidifying unit (humidity levels, moisturize mode)
+    humidify: bool = True
+
+
+# Profile of units whose model is unknown or missing: everything, as before
+# model detection
+DEFAULT_PROFILE = ModelProfile()
+
+# Model families that differ from the default, matched by the longest prefix
+# of the reported model so color and regional variants (MC55W-W, MC55WBK,
+# ...) share a profile. Humidifying families (MCK55W, MCK70W) support
+# everything and need no entry.
+MODEL_PROFILES = {
+    # Purifiers without a humidifying unit: no humidity control, and only a
+    # dust sensor, no temperature or humidity one
+    "MC55W": ModelProfile(sensors=frozenset({"pm25"}), humidify=False),
+    "MC80W": ModelProfile(sensors=frozenset({"pm25"}), humidify=False),
+}
+
+
+@cache
+def model_profile(model: str | None) -> ModelProfile:
+    """Return the profile of a model, DEFAULT_PROFILE if it is unknown."""
+    if not model:
+        return DEFAULT_PROFILE
+    model = model.upper()
+    family = max(
+        (family for family in MODEL_PROFILES if model.startswith(family)),
+        key=len,
+        default=None,
+    )
+    return DEFAULT_PROFILE if family is None else MODEL_PROFILES[family]
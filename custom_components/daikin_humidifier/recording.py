@@ -0,0 +1,213 @@
+"""
+Capture and replay of the traffic between the API client and the units.
+
+Like transport, this module does not depend on Home Assistant, so captures
+taken by the integration can be replayed in benchmarks/loadtest.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from logging.handlers import QueueListener, RotatingFileHandler
+from typing import TYPE_CHECKING, Any
+
+from .const import TRAFFIC_BACKUPS, TRAFFIC_MAX_BYTES
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+# Error of a record whose request timed out
+ERROR_TIMEOUT = "timeout"
+
+
+@dataclass(frozen=True, slots=True)
+class TrafficRecord:
+    """One request sent to a unit and what came back."""
+
+    # Unix timestamp at which the request was sent
+    time: float
+    host: str
+    method: str
+    endpoint: str
+    params: dict[str, str] | None
+    # Seconds until the answer or the error
+    duration: float
+    status: int | None = None
+    body: bytes = b""
+    # ERROR_TIMEOUT, or the class name of the exception the request raised
+    error: str | None = None
+
+    def to_json(self) -> str:
+        """Return the record as one compact JSON line."""
+        data: dict[str, Any] = {
+            "t": round(self.time, 3),
+            "h": self.host,
+            "m": self.method,
+            "e": self.endpoint,
+            "d": round(self.duration, 4),
+        }
+        if self.params:
+            data["p"] = self.params
+        if self.error is None:
+            data["s"] = self.status
+            # Latin-1 maps every byte to one character, so the body is exact
+            data["b"] = self.body.decode("latin-1")
+        else:
+            data["x"] = self.error
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str) -> TrafficRecord:
+        """Return the record stored in a JSON line."""
+        data = json.loads(line)
+        return cls(
+            time=data["t"],
+            host=data["h"],
+            method=data["m"],
+            endpoint=data["e"],
+            params=data.get("p"),
+            duration=data["d"],
+            status=data.get("s"),
+            body=data.get("b", "").encode("latin-1"),
+            error=data.get("x"),
+        )
+
+
+def _gzip_rotator(source: str, destination: str) -> None:
+    """Compress a full capture file into its backup."""
+    with open(source, "rb") as plain, gzip.open(destination, "wb") as packed:  # noqa: PTH123
+        shutil.copyfileobj(plain, packed)
+    os.remove(source)  # noqa: PTH107
+
+
+class TrafficRecorder:
+    """
+    Append traffic records to a rotating capture file.
+
+    Records are handed to a background thread, so recording never blocks
+    the event loop. Once the file reaches max_bytes it is compressed to
+    <path>.1.gz, the older backups shift up, and at most backups are kept.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = TRAFFIC_MAX_BYTES,
+        backups: int = TRAFFIC_BACKUPS,
+    ) -> None:
+        """
+        Start the writer thread; the file is opened by the first record.
+
+        Args:
+            path: Capture file
+            max_bytes: Size at which the file is rotated
+            backups: Compressed earlier files kept
+
+        """
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=max_bytes,
+            backupCount=backups,
+            encoding="utf-8",
+            delay=True,
+        )
+        handler.namer = lambda name: f"{name}.gz"
+        handler.rotator = _gzip_rotator
+        self._handler = handler
+        self._queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+        self.records = 0
+
+    def record(self, record: TrafficRecord) -> None:
+        """Queue a record to be written."""
+        self.records += 1
+        self._queue.put_nowait(logging.makeLogRecord({"msg": record.to_json()}))
+
+    def close(self) -> None:
+        """Write the queued records and close the file; blocks until done."""
+        self._listener.stop()
+        self._handler.close()
+
+
+def read_capture(paths: Iterable[Path]) -> list[TrafficRecord]:
+    """Return the records of capture files, plain or compressed, by time."""
+    records = []
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as file:
+            records.extend(TrafficRecord.from_json(line) for line in file if line)
+    records.sort(key=lambda record: record.time)
+    return records
+
+
+class ReplayTransport:
+    """
+    Answer requests from the captured traffic of one unit.
+
+    Each endpoint plays back its own records in order, starting over once
+    they run out. Answers arrive after the captured duration divided by
+    speed: 1 is real time, 10 ten times faster and 0 at once. Captured
+    timeouts and errors are raised as TimeoutError and ConnectionError.
+    """
+
+    def __init__(self, records: Iterable[TrafficRecord], speed: float = 1.0) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            records: Captured records of the unit, oldest first
+            speed: Playback speed of the captured durations, 0 for none
+
+        """
+        self._answers: dict[str, deque[TrafficRecord]] = defaultdict(deque)
+        for record in records:
+            self._answers[record.endpoint].append(record)
+        self.speed = speed
+        self.replayed = 0
+
+    async def async_request(
+        self,
+        method: str,  # noqa: ARG002
+        path: str,
+        params: dict | None = None,  # noqa: ARG002
+    ) -> tuple[int, bytes]:
+        """Return the next captured answer of the endpoint."""
+        if not (answers := self._answers.get(path)):
+            msg = f"No captured traffic for {path}"
+            raise ConnectionError(msg)
+        record = answers[0]
+        answers.rotate(-1)
+        self.replayed += 1
+        if self.speed:
+            await asyncio.sleep(record.duration / self.speed)
+        if record.error == ERROR_TIMEOUT:
+            raise TimeoutError
+        if record.error is not None:
+            raise ConnectionError(record.error)
+        return record.status, record.body
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+
+def replay_transports(
+    records: Iterable[TrafficRecord], speed: float = 1.0
+) -> dict[str, ReplayTransport]:
+    """Return a replay transport for each unit in the records, by host."""
+    by_host: dict[str, list[TrafficRecord]] = defaultdict(list)
+    for record in records:
+        by_host[record.host].append(record)
+    return {
+        host: ReplayTransport(host_records, speed)
+        for host, host_records in by_host.items()
+    }
@@ -0,0 +1,101 @@
+"""Recovery of units whose address changed, found again by their MAC."""
+
+from __future__ import annotations
+
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, LOGGER, RELOCATE_CONCURRENCY, RELOCATE_INTERVAL
+from .discovery import async_get_scan_networks, async_scan
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import DaikinConfigEntry
+
+DATA_RELOCATOR: HassKey[DaikinRelocator] = HassKey(f"{DOMAIN}_relocator")
+
+
+@callback
+def async_get_relocator(hass: HomeAssistant) -> DaikinRelocator:
+    """Return the relocator shared by all config entries."""
+    if (relocator := hass.data.get(DATA_RELOCATOR)) is None:
+        relocator = hass.data[DATA_RELOCATOR] = DaikinRelocator(hass)
+    return relocator
+
+
+class DaikinRelocator:
+    """
+    Find units that stopped answering at their address, by their MAC.
+
+    Units given up on by their circuit breaker are collected, and a single
+    background scan of the local networks looks for all of them at once;
+    a unit found at another address gets its entry's host updated in place.
+    Scans start at most once every RELOCATE_INTERVAL seconds, so a unit
+    that is simply switched off does not keep the network busy.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the relocator."""
+        self.hass = hass
+        # Entries to look for in the next scan, by the MAC of their unit
+        self._lost: dict[str, DaikinConfigEntry] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._scanned_at: float | None = None
+
+    @callback
+    def async_locate(self, entry: DaikinConfigEntry) -> None:
+        """Look for an entry's unit in the next scan, starting one if allowed."""
+        if entry.unique_id is None:
+            return
+        # The config flow uses the unit's MAC as unique ID when it reports one
+        self._lost[entry.unique_id] = entry
+        if self._task is not None and not self._task.done():
+            return
+        if (
+            self._scanned_at is not None
+            and monotonic() - self._scanned_at < RELOCATE_INTERVAL
+        ):
+            return
+        self._scanned_at = monotonic()
+        # Not started eagerly, the caller is in the middle of a refresh
+        self._task = self.hass.async_create_background_task(
+            self._async_scan(), f"{DOMAIN} relocation scan", eager_start=False
+        )
+
+    async def _async_scan(self) -> None:
+        """Scan the local networks and move the lost units that were found."""
+        devices = await async_scan(
+            async_get_clientsession(self.hass),
+            await async_get_scan_networks(self.hass),
+            concurrency=RELOCATE_CONCURRENCY,
+        )
+        lost, self._lost = self._lost, {}
+        for device in devices:
+            if (entry := lost.pop(device.mac, None)) is None:
+                continue
+            if entry.state is not ConfigEntryState.LOADED:
+                continue
+            if device.host == entry.data[CONF_HOST]:
+                # Answering at its address again; the breaker will notice
+                continue
+            LOGGER.info(
+                "%s moved from %s to %s",
+                entry.title,
+                entry.data[CONF_HOST],
+                device.host,
+            )
+            # Applied to the running entry by its update listener
+            self.hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_HOST: device.host}
+            )
+        for entry in lost.values():
+            LOGGER.debug("%s not found on the local networks", entry.title)
@@ -0,0 +1,160 @@
+"""Per-device request scheduling for Daikin Humidifier."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from enum import IntEnum
+from itertools import count
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+class RequestPriority(IntEnum):
+    """Order in which queued requests to a device are sent, lowest first."""
+
+    WRITE = 0
+    CONTROL = 1
+    POLL = 2
+
+
+class _SharedRequestCancelledError(Exception):
+    """Exception given to callers sharing a request whose owner was cancelled."""
+
+
+class DaikinRequestScheduler:
+    """
+    Queue the requests to one device and send them in priority order.
+
+    At most max_in_flight requests are sent at once; the others wait in a
+    priority queue, first in first out within a priority, so a user's write
+    only ever waits for the requests already sent. A request submitted with
+    a key that matches one still waiting in the queue is not queued again:
+    its caller gets the result of the queued one, or queues its own if that
+    one is cancelled. Requests already sent are never shared, so a poll
+    queued after a write always reads the device after the write.
+    """
+
+    def __init__(self, max_in_flight: int = 1) -> None:
+        """
+        Initialize an empty scheduler.
+
+        Args:
+            max_in_flight: Requests sent to the device at once at most
+
+        """
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = count()
+        # Result futures of the queued requests that can be shared, by key
+        self._waiting: dict[str, asyncio.Future[Any]] = {}
+        # Requests that got the result of a queued one instead of their own
+        self.shared = 0
+
+    @property
+    def max_in_flight(self) -> int:
+        """Return the most requests sent at once."""
+        return self._max_in_flight
+
+    @max_in_flight.setter
+    def max_in_flight(self, value: int) -> None:
+        """Set the most requests sent at once, sending queued ones if it grew."""
+        self._max_in_flight = value
+        self._dispatch()
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting to be sent."""
+        return sum(not ticket.done() for _, _, ticket in self._queue)
+
+    async def async_submit[T](
+        self,
+        priority: RequestPriority,
+        key: str | None,
+        send: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Send a request once its turn has come and return its result.
+
+        Args:
+            priority: Priority class of the request
+            key: Identity of the request for sharing it while it is queued,
+                None for requests that must always be sent (writes)
+            send: Coroutine function sending the request
+
+        """
+        while key is not None and (shared := self._waiting.get(key)) is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(shared)
+            except _SharedRequestCancelledError:
+                self.shared -= 1
+
+        result: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        if key is not None:
+            self._waiting[key] = result
+        try:
+            await self._async_acquire(priority)
+        except BaseException:
+            self._settle(key, result, _SharedRequestCancelledError(key))
+            raise
+        # Sent from here on, so no longer shared with later requests
+        if key is not None and self._waiting.get(key) is result:
+            del self._waiting[key]
+        try:
+            value = await send()
+        except asyncio.CancelledError:
+            self._settle(key, result, _SharedRequestCancelledError(key))
+            raise
+        except Exception as exception:
+            self._settle(key, result, exception)
+            raise
+        else:
+            result.set_result(value)
+            return value
+        finally:
+            self._in_flight -= 1
+            self._dispatch()
+
+    async def _async_acquire(self, priority: RequestPriority) -> None:
+        """Wait until the request may be sent."""
+        if self._in_flight < self._max_in_flight and not self._queue:
+            self._in_flight += 1
+            return
+        ticket: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._order), ticket))
+        try:
+            await ticket
+        except asyncio.CancelledError:
+            if ticket.done() and not ticket.cancelled():
+                # Cancelled right after getting the slot; hand it on
+                self._in_flight -= 1
+                self._dispatch()
+            else:
+                # Dropped from the queue when its turn comes
+                ticket.cancel()
+            raise
+
+    def _dispatch(self) -> None:
+        """Let queued requests through while there is room in flight."""
+        queue = self._queue
+        while queue and self._in_flight < self._max_in_flight:
+            _, _, ticket = heapq.heappop(queue)
+            if ticket.done():
+                continue
+            self._in_flight += 1
+            ticket.set_result(None)
+
+    def _settle(
+        self, key: str | None, result: asyncio.Future[Any], exception: BaseException
+    ) -> None:
+        """Fail a request's result future for the callers sharing it."""
+        if key is not None and self._waiting.get(key) is result:
+            del self._waiting[key]
+        if not result.done():
+            result.set_exception(exception)
+            # Retrieved, so no error is logged when nobody shared the request
+            result.exception()
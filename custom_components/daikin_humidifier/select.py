@@ -26,9 +26,9 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the select platform."""
-    async_add_entities(
-        [DaikinHumidityModeSelect(coordinator=entry.runtime_data.coordinator)]
-    )
+    coordinator = entry.runtime_data.coordinator
+    if coordinator.profile.humidify:
+        async_add_entities([DaikinHumidityModeSelect(coordinator=coordinator)])
 
 
 class DaikinHumidityModeSelect(DaikinEntity, SelectEntity):
@@ -39,20 +39,16 @@ class DaikinHumidityModeSelect(DaikinEntity, SelectEntity):
 
     def __init__(self, coordinator: DaikinDataUpdateCoordinator) -> None:
         """Initialize the select entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({"humidity_level"}))
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}_humidity_mode"
 
     @property
     def current_option(self) -> str | None:
         """Return the selected entity option to represent the entity state."""
-        control = self.coordinator.data.get("control", {})
-        humd_value = control.get("humd")
-        return HUMIDITY_MODES.get(humd_value)
+        return HUMIDITY_MODES.get(self.coordinator.data.humidity_level)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         humd_value = HUMIDITY_REVERSE.get(option)
         if humd_value:
-            client = self.coordinator.config_entry.runtime_data.client
-            await client.async_set_control_info(humidity=humd_value)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_set_control(humidity=humd_value)
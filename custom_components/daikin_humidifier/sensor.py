@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, replace
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -13,91 +15,431 @@ from homeassistant.components.sensor import (
 from homeassistant.const import (
     CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
     PERCENTAGE,
+    EntityCategory,
     UnitOfTemperature,
+    UnitOfTime,
 )
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 
+from .const import STATISTICS_STATE_INTERVAL
+from .coordinator import DIAGNOSTICS_KEY, HISTORY_KEY
+from .data import ReportPolicy
 from .entity import DaikinEntity
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import DaikinDataUpdateCoordinator
-    from .data import DaikinConfigEntry
+    from .data import DaikinConfigEntry, DaikinDeviceState
+
+# Policy of readings the options set nothing for: every change is written
+DEFAULT_REPORT_POLICY = ReportPolicy()
+
+
+@dataclass(frozen=True, kw_only=True)
+class DaikinSensorEntityDescription(SensorEntityDescription):
+    """Describes a Daikin sensor."""
+
+    value_fn: Callable[[DaikinDeviceState], int | float | None]
+
+
+@dataclass(frozen=True, kw_only=True)
+class DaikinDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor reporting on the polling of a Daikin device."""
+
+    value_fn: Callable[[DaikinDataUpdateCoordinator], int | float | None]
+
 
 ENTITY_DESCRIPTIONS = (
-    SensorEntityDescription(
+    DaikinSensorEntityDescription(
         key="pm25",
         name="PM2.5",
         device_class=SensorDeviceClass.PM25,
         native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda state: state.pm25,
     ),
-    SensorEntityDescription(
+    DaikinSensorEntityDescription(
         key="hhum",
         name="Humidity",
         device_class=SensorDeviceClass.HUMIDITY,
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda state: state.hhum,
     ),
-    SensorEntityDescription(
+    DaikinSensorEntityDescription(
         key="htemp",
         name="Temperature",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda state: state.htemp,
     ),
 )
 
 
+def _milliseconds(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _response_time(coordinator: DaikinDataUpdateCoordinator) -> float | None:
+    """Return the mean response time over every endpoint of the device."""
+    stats = coordinator.config_entry.runtime_data.client.stats.values()
+    count = sum(endpoint.latency.count for endpoint in stats)
+    if not count:
+        return None
+    return _milliseconds(sum(endpoint.latency.total for endpoint in stats) / count)
+
+
+def _request_errors(coordinator: DaikinDataUpdateCoordinator) -> int:
+    """Return the failed requests over every endpoint of the device."""
+    stats = coordinator.config_entry.runtime_data.client.stats.values()
+    return sum(endpoint.errors + endpoint.timeouts for endpoint in stats)
+
+
+DIAGNOSTIC_DESCRIPTIONS = (
+    DaikinDiagnosticSensorEntityDescription(
+        key="refresh_duration",
+        name="Refresh duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _milliseconds(coordinator.update_duration.last),
+    ),
+    DaikinDiagnosticSensorEntityDescription(
+        key="response_time",
+        name="Response time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=_response_time,
+    ),
+    DaikinDiagnosticSensorEntityDescription(
+        key="poll_lag",
+        name="Poll lag",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.poll_lag,
+    ),
+    DaikinDiagnosticSensorEntityDescription(
+        key="request_errors",
+        name="Request errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=_request_errors,
+    ),
+)
+
+
+def _history_descriptions(
+    description: DaikinSensorEntityDescription,
+) -> tuple[SensorEntityDescription, SensorEntityDescription]:
+    """Derive the average and trend descriptions of a sensor."""
+    average = replace(
+        description,
+        key=f"{description.key}_average",
+        name=f"{description.name} average",
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+    )
+    # A rate has no device class, only the unit of the reading per hour
+    trend = SensorEntityDescription(
+        key=f"{description.key}_trend",
+        name=f"{description.name} trend",
+        native_unit_of_measurement=f"{description.native_unit_of_measurement}/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    )
+    return average, trend
+
+
 async def async_setup_entry(
     hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
     entry: DaikinConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    async_add_entities(
-        DaikinSensor(
-            coordinator=entry.runtime_data.coordinator,
-            entity_description=entity_description,
-        )
+    coordinator = entry.runtime_data.coordinator
+    profile = coordinator.profile
+    descriptions = [
+        entity_description
         for entity_description in ENTITY_DESCRIPTIONS
+        if "sensors" in profile.blocks and entity_description.key in profile.sensors
+    ]
+    history_sensors: list[SensorEntity] = []
+    for entity_description in descriptions:
+        average, trend = _history_descriptions(entity_description)
+        history_sensors.append(
+            DaikinAverageSensor(
+                coordinator=coordinator,
+                entity_description=average,
+                source_key=entity_description.key,
+            )
+        )
+        history_sensors.append(
+            DaikinTrendSensor(
+                coordinator=coordinator,
+                entity_description=trend,
+                source_key=entity_description.key,
+            )
+        )
+    async_add_entities(
+        [
+            *(
+                DaikinSensor(
+                    coordinator=coordinator,
+                    entity_description=entity_description,
+                )
+                for entity_description in descriptions
+            ),
+            *(
+                DaikinDiagnosticSensor(
+                    coordinator=coordinator,
+                    entity_description=entity_description,
+                )
+                for entity_description in DIAGNOSTIC_DESCRIPTIONS
+            ),
+            *history_sensors,
+        ]
     )
 
 
 class DaikinSensor(DaikinEntity, SensorEntity):
-    """Daikin Sensor class."""
+    """
+    Daikin Sensor class.
+
+    A new reading is written to the state as the coordinator's report policy
+    for it allows: changes within the deadbands are held back until the
+    maximum report interval, and significant ones until the minimum report
+    interval has passed since the last write. In long-term statistics mode
+    the reading is recorded as hourly statistics by the coordinator, so the
+    sensor drops its state class and writes at most every
+    STATISTICS_STATE_INTERVAL. When the interval of a held back reading
+    ends, the current reading is checked against the policy again, so one
+    that has moved back within the deadbands is not written.
+    """
+
+    entity_description: DaikinSensorEntityDescription
+
+    # Monotonic time of the last state write, and the statistics mode,
+    # availability and staleness it was written with
+    _written_at: float | None = None
+    _written_as: tuple[bool, bool, bool] | None = None
+    _write_unsub: CALLBACK_TYPE | None = None
+    _write_due: float | None = None
 
     def __init__(
         self,
         coordinator: DaikinDataUpdateCoordinator,
-        entity_description: SensorEntityDescription,
+        entity_description: DaikinSensorEntityDescription,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({entity_description.key}))
         self.entity_description = entity_description
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{entity_description.key}"
         )
+        # Reading shown in the state, the last one written
+        self._written_value = (
+            None
+            if coordinator.data is None
+            else entity_description.value_fn(coordinator.data)
+        )
 
     @property
-    def native_value(self) -> str | int | float | None:
+    def native_value(self) -> int | float | None:
         """Return the native value of the sensor."""
-        sensors = self.coordinator.data.get("sensors", {})
-        value = sensors.get(self.entity_description.key)
+        return self._written_value
 
-        if value is None:
+    @property
+    def state_class(self) -> SensorStateClass | str | None:
+        """Return no state class while the statistics are written directly."""
+        if self.coordinator.long_term_statistics:
             return None
+        return super().state_class
+
+    async def async_added_to_hass(self) -> None:
+        """Count the state written on adding as the first write."""
+        await super().async_added_to_hass()
+        self._written_at = monotonic()
+        self._written_as = self._write_context()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the pending state write."""
+        self._cancel_write()
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new reading if its report policy allows it now."""
+        value = self.entity_description.value_fn(self.coordinator.data)
+        if self._written_at is None or self._written_as != self._write_context():
+            # Availability, staleness and mode changes are written at once
+            self._async_write(value)
+            return
+        self._async_report(value)
+
+    @callback
+    def _async_write_held_back(self, _now: datetime) -> None:
+        """Write the reading held back, if its report policy still wants it."""
+        self._write_unsub = None
+        self._write_due = None
+        self._async_report(self.entity_description.value_fn(self.coordinator.data))
 
-        # Try to convert to appropriate type
-        try:
-            # For PM2.5 and humidity, return as integer
-            if self.entity_description.key in ("pm25", "hhum"):
-                return int(value)
-            # For temperature, return as float
-            if self.entity_description.key == "htemp":
-                return float(value)
-        except (ValueError, TypeError):
+    @callback
+    def _async_report(self, value: float | None) -> None:
+        """Write a reading now, later, or not at all, as its policy says."""
+        if (wait := self._report_wait(value)) is None:
+            # Nothing left to report, whatever was held back
+            self._cancel_write()
+            return
+        due = self._written_at + wait
+        if due <= monotonic():
+            self._async_write(value)
+        elif self._write_due is None or due < self._write_due:
+            self._cancel_write()
+            self._write_due = due
+            self._write_unsub = async_call_later(
+                self.hass, due - monotonic(), self._async_write_held_back
+            )
+
+    def _report_wait(self, value: float | None) -> float | None:
+        """Return the seconds from the last write to write a reading, or None."""
+        coordinator = self.coordinator
+        policy = coordinator.report_policies.get(self.entity_description.key)
+        if policy is None:
+            policy = DEFAULT_REPORT_POLICY
+        if policy.significant(self._written_value, value):
+            wait = policy.min_interval
+        elif value != self._written_value and policy.max_interval:
+            wait = policy.max_interval
+        else:
             return None
+        if coordinator.long_term_statistics:
+            return max(wait, STATISTICS_STATE_INTERVAL)
+        return wait
+
+    @callback
+    def _async_write(self, value: float | None) -> None:
+        """Write a reading to the state and note when."""
+        self._cancel_write()
+        self._written_value = value
+        self._written_at = monotonic()
+        self._written_as = self._write_context()
+        self.async_write_ha_state()
+
+    @callback
+    def _write_context(self) -> tuple[bool, bool, bool]:
+        """Return what, besides the reading, a state write shows."""
+        return (self.coordinator.long_term_statistics, self.available, self.stale)
+
+    @callback
+    def _cancel_write(self) -> None:
+        """Cancel the write of a held back reading."""
+        if self._write_unsub is not None:
+            self._write_unsub()
+            self._write_unsub = None
+        self._write_due = None
+
+
+class DaikinDiagnosticSensor(DaikinEntity, SensorEntity):
+    """Sensor reporting on the polling of a Daikin device."""
+
+    entity_description: DaikinDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: DaikinDataUpdateCoordinator,
+        entity_description: DaikinDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, frozenset({DIAGNOSTICS_KEY}))
+        self.entity_description = entity_description
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_{entity_description.key}"
+        )
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the device fails, when the numbers matter most."""
+        return True
+
+    @property
+    def native_value(self) -> int | float | None:
+        """Return the native value of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
 
-        return value
+class DaikinHistorySensor(DaikinEntity, SensorEntity):
+    """Base class of the sensors computed from a reading's recent history."""
+
+    def __init__(
+        self,
+        coordinator: DaikinDataUpdateCoordinator,
+        entity_description: SensorEntityDescription,
+        source_key: str,
+    ) -> None:
+        """
+        Initialize the sensor class.
+
+        Args:
+            coordinator: Coordinator holding the history
+            entity_description: Description of this sensor
+            source_key: History key of the reading it is computed from
+
+        """
+        super().__init__(coordinator, frozenset({HISTORY_KEY}))
+        self.entity_description = entity_description
+        self._source_key = source_key
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_{entity_description.key}"
+        )
+
+
+class DaikinAverageSensor(DaikinHistorySensor):
+    """Rolling mean of a reading, with its minimum and maximum as attributes."""
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean over the history window."""
+        coordinator = self.coordinator
+        return coordinator.history.mean(self._source_key, coordinator.history_window)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the minimum and maximum over the history window."""
+        history = self.coordinator.history
+        window = self.coordinator.history_window
+        return {
+            "min": history.minimum(self._source_key, window),
+            "max": history.maximum(self._source_key, window),
+            "samples": len(history),
+            "window_minutes": window / 60,
+        }
+
+
+class DaikinTrendSensor(DaikinHistorySensor):
+    """Least-squares trend of a reading over the history window."""
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the trend in units per hour."""
+        coordinator = self.coordinator
+        slope = coordinator.history.slope(self._source_key, coordinator.history_window)
+        return None if slope is None else slope * 3600
@@ -0,0 +1,155 @@
+"""Services for Daikin Humidifier."""
+
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ATTR_FLOOR_ID,
+    ATTR_LABEL_ID,
+)
+from homeassistant.core import ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_config_entry_ids
+
+from .api import DaikinApiClientError
+from .const import (
+    CONTROL_CONFIRM_DELAY,
+    DOMAIN,
+    FAN_REVERSE,
+    HUMIDITY_REVERSE,
+    MODE_REVERSE,
+    POWER_OFF,
+    POWER_ON,
+    SET_CONTROL_CONCURRENCY,
+)
+from .coordinator import ControlWrite
+from .fleet import async_get_fleet
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceResponse
+
+    from .data import DaikinConfigEntry
+
+SERVICE_SET_CONTROL = "set_control"
+
+ATTR_POWER = "power"
+ATTR_MODE = "mode"
+ATTR_HUMIDITY = "humidity"
+ATTR_FAN_SPEED = "fan_speed"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_FORCE = "force"
+ATTR_ALL_UNITS = "all_units"
+
+TARGET_FIELDS = (
+    ATTR_ENTITY_ID,
+    ATTR_DEVICE_ID,
+    ATTR_AREA_ID,
+    ATTR_FLOOR_ID,
+    ATTR_LABEL_ID,
+)
+
+# A target is required, unless every unit is asked for with all_units; an
+# empty target would otherwise change the whole fleet by mistake
+SET_CONTROL_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **cv.ENTITY_SERVICE_FIELDS,
+            vol.Optional(ATTR_POWER): cv.boolean,
+            vol.Optional(ATTR_MODE): vol.In(MODE_REVERSE),
+            vol.Optional(ATTR_HUMIDITY): vol.In(HUMIDITY_REVERSE),
+            vol.Optional(ATTR_FAN_SPEED): vol.In(FAN_REVERSE),
+            vol.Optional(
+                ATTR_MAX_CONCURRENCY, default=SET_CONTROL_CONCURRENCY
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+            vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+            vol.Optional(ATTR_ALL_UNITS, default=False): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_POWER, ATTR_MODE, ATTR_HUMIDITY, ATTR_FAN_SPEED),
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def _async_set_control(call: ServiceCall) -> ServiceResponse:
+        """Write the same control change to many units at once."""
+        entries = await _async_target_entries(hass, call)
+        power = call.data.get(ATTR_POWER)
+        control = {
+            "power": None if power is None else (POWER_ON if power else POWER_OFF),
+            "mode": MODE_REVERSE.get(call.data.get(ATTR_MODE)),
+            "humidity": HUMIDITY_REVERSE.get(call.data.get(ATTR_HUMIDITY)),
+            "fan_speed": FAN_REVERSE.get(call.data.get(ATTR_FAN_SPEED)),
+        }
+        force = call.data[ATTR_FORCE]
+        semaphore = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+
+        async def _async_write(entry: DaikinConfigEntry) -> dict[str, Any]:
+            coordinator = entry.runtime_data.coordinator
+            start = monotonic()
+            async with semaphore:
+                try:
+                    # The fleet refreshes every unit once below, not each write
+                    outcome = await coordinator.async_set_control(
+                        **control, confirm=False, force=force
+                    )
+                except DaikinApiClientError as exception:
+                    result = {"success": False, "error": str(exception)}
+                else:
+                    result = {"success": outcome is not ControlWrite.REJECTED}
+                    if outcome is ControlWrite.SKIPPED:
+                        # Already as asked: nothing written, no refresh below
+                        result["skipped"] = True
+                    elif outcome is ControlWrite.REJECTED:
+                        result["error"] = "Not acknowledged by the device"
+            result["duration"] = round(monotonic() - start, 3)
+            return {"title": entry.title, **result}
+
+        results = await asyncio.gather(*(_async_write(entry) for entry in entries))
+        async_get_fleet(hass).async_refresh_wave(
+            (
+                entry.runtime_data.coordinator
+                for entry, result in zip(entries, results, strict=True)
+                if not result.get("skipped")
+            ),
+            delay=CONTROL_CONFIRM_DELAY,
+        )
+        return {
+            "results": {
+                entry.entry_id: result
+                for entry, result in zip(entries, results, strict=True)
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_CONTROL,
+        _async_set_control,
+        schema=SET_CONTROL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def _async_target_entries(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[DaikinConfigEntry]:
+    """Return the loaded entries targeted by a call, or all with all_units."""
+    entries = hass.config_entries.async_loaded_entries(DOMAIN)
+    if call.data[ATTR_ALL_UNITS]:
+        return entries
+    if not any(call.data.get(key) for key in TARGET_FIELDS):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="no_target"
+        )
+    entry_ids = await async_extract_config_entry_ids(hass, call)
+    return [entry for entry in entries if entry.entry_id in entry_ids]
@@ -0,0 +1,74 @@
+"""Request statistics for Daikin Humidifier."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket
+# collects everything slower.
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("buckets", "count", "last", "maximum", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.last: float | None = None
+
+    def record(self, seconds: float) -> None:
+        """Add one measurement."""
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.maximum = max(self.maximum, seconds)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean latency in seconds, None before any measurement."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram in milliseconds for diagnostics."""
+        labels = [f"<={bound * 1000:g}ms" for bound in LATENCY_BUCKETS]
+        labels.append(f">{LATENCY_BUCKETS[-1] * 1000:g}ms")
+        return {
+            "count": self.count,
+            "mean_ms": None if self.mean is None else round(self.mean * 1000, 1),
+            "last_ms": None if self.last is None else round(self.last * 1000, 1),
+            "max_ms": round(self.maximum * 1000, 1),
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+class EndpointStats:
+    """Counters of the requests sent to one endpoint of a device."""
+
+    __slots__ = ("bytes_received", "errors", "last_success", "latency", "timeouts")
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes_received = 0
+        # Unix timestamp of the last successful response
+        self.last_success: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "latency": self.latency.as_dict(),
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes_received": self.bytes_received,
+            "last_success": self.last_success,
+        }
@@ -0,0 +1,284 @@
+"""HTTP transports for the Daikin API client."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode, urlsplit
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# Bytes of response head (status line and headers) accepted at most
+MAX_HEAD = 8192
+
+
+class ProtocolError(ConnectionError):
+    """Exception to indicate a response that is not valid HTTP."""
+
+
+def _split_host(host: str) -> tuple[str, int]:
+    """
+    Return the address and port of a host with an optional port.
+
+    IPv6 literals are taken with a port only in brackets ([fe80::1]:8080),
+    so a bare one (fe80::1) is not split at its last colon.
+    """
+    if host.count(":") > 1 and not host.startswith("["):
+        return host, 80
+    parts = urlsplit(f"//{host}")
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    return parts.hostname or host, port or 80
+
+
+class AiohttpTransport:
+    """Send requests through a shared aiohttp session."""
+
+    def __init__(self, session: aiohttp.ClientSession, base_url: str) -> None:
+        """Initialize the transport."""
+        self._session = session
+        self._base_url = base_url
+
+    async def async_request(
+        self, method: str, path: str, params: dict | None = None
+    ) -> tuple[int, bytes]:
+        """Send a request and return the status and body."""
+        async with self._session.request(
+            method=method, url=self._base_url + path, params=params
+        ) as response:
+            return response.status, await response.read()
+
+    def close(self) -> None:
+        """Nothing to close, the session is shared."""
+
+
+class _HttpConnection(asyncio.Protocol):
+    """One TCP connection reading a single HTTP/1.1 response at a time."""
+
+    def __init__(self) -> None:
+        """Initialize the connection before it is made."""
+        self.transport: asyncio.Transport | None = None
+        self.closed = False
+        self._buffer = bytearray()
+        self._waiter: asyncio.Future[tuple[int, bytes, bool]] | None = None
+        self._head_end = -1
+        self._status = 0
+        self._length: int | None = None
+        self._chunked = False
+        self._keep_alive = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        self.transport = transport  # type: ignore[assignment]
+
+    def data_received(self, data: bytes) -> None:
+        """Buffer the data and complete the response once it is whole."""
+        self._buffer += data
+        if self._waiter is None or self._waiter.done():
+            return
+        try:
+            if self._head_end < 0 and not self._parse_head():
+                return
+            self._complete_if_whole(eof=False)
+        except ProtocolError as exception:
+            self._waiter.set_exception(exception)
+
+    def eof_received(self) -> bool:
+        """Complete a response delimited by the end of the connection."""
+        self._finish_on_close()
+        return False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Fail the pending response unless the close completed it."""
+        self._finish_on_close(exc)
+
+    def request(self, data: bytes) -> asyncio.Future[tuple[int, bytes, bool]]:
+        """Send a request; the future gets status, body and reusability."""
+        loop = asyncio.get_running_loop()
+        self._waiter = loop.create_future()
+        self._buffer.clear()
+        self._head_end = -1
+        self.transport.write(data)
+        return self._waiter
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.closed = True
+        if self.transport is not None:
+            self.transport.close()
+
+    def _finish_on_close(self, exc: Exception | None = None) -> None:
+        """Handle the peer closing the connection."""
+        self.closed = True
+        waiter = self._waiter
+        if waiter is None or waiter.done():
+            return
+        if self._head_end >= 0 and self._length is None and not self._chunked:
+            self._keep_alive = False
+            self._complete_if_whole(eof=True)
+            return
+        waiter.set_exception(
+            exc or ProtocolError("Connection closed before the response ended")
+        )
+
+    def _parse_head(self) -> bool:
+        """Parse the status line and headers, False if not all received."""
+        end = self._buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self._buffer) > MAX_HEAD:
+                msg = "Response head too long"
+                raise ProtocolError(msg)
+            return False
+        lines = bytes(self._buffer[:end]).decode("latin-1").split("\r\n")
+        version, _, rest = lines[0].partition(" ")
+        try:
+            self._status = int(rest[:3])
+        except ValueError as exception:
+            msg = f"Invalid status line: {lines[0]!r}"
+            raise ProtocolError(msg) from exception
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        self._head_end = end + 4
+        self._chunked = "chunked" in headers.get("transfer-encoding", "")
+        length = headers.get("content-length")
+        if self._chunked or length is None:
+            self._length = None
+        elif length.isdecimal():
+            self._length = int(length)
+        else:
+            msg = f"Invalid Content-Length: {length!r}"
+            raise ProtocolError(msg)
+        self._keep_alive = (
+            version == "HTTP/1.1"
+            and headers.get("connection") != "close"
+            and (self._length is not None or self._chunked)
+        )
+        return True
+
+    def _complete_if_whole(self, *, eof: bool) -> None:
+        """Resolve the waiter once the body is complete."""
+        body = self._buffer[self._head_end :]
+        if self._length is not None:
+            if len(body) < self._length:
+                return
+            body = body[: self._length]
+        elif self._chunked:
+            if not body.endswith(b"0\r\n\r\n"):
+                return
+            body = _dechunk(body)
+        elif not eof:
+            return
+        self._waiter.set_result((self._status, bytes(body), self._keep_alive))
+
+
+def _dechunk(data: bytearray) -> bytearray:
+    """Decode a complete chunked body."""
+    body = bytearray()
+    position = 0
+    while True:
+        try:
+            line_end = data.index(b"\r\n", position)
+            size = int(data[position:line_end].split(b";")[0], 16)
+        except ValueError as exception:
+            msg = "Invalid chunked body"
+            raise ProtocolError(msg) from exception
+        if size < 0:
+            msg = "Invalid chunked body"
+            raise ProtocolError(msg)
+        if not size:
+            return body
+        start = line_end + 2
+        body += data[start : start + size]
+        position = start + size + 2
+
+
+class RawTransport:
+    """
+    Send requests over a minimal asyncio HTTP/1.1 client.
+
+    One connection per device is kept open and reused while the firmware
+    keeps it alive; requests on it are sent one at a time. A device that
+    closes connections after every response is switched to one-shot
+    connections for good. Only what the device's replies need is supported:
+    GET-style requests, and bodies delimited by Content-Length, chunked
+    encoding or the end of the connection.
+    """
+
+    def __init__(self, host: str) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            host: IP address or hostname of the device, with an optional port
+
+        """
+        self._address = _split_host(host)
+        name, port = self._address
+        # IPv6 literals are bracketed in the Host header, as in URLs
+        self._host = f"[{name}]" if ":" in name else name
+        if port != 80:  # noqa: PLR2004
+            self._host += f":{port}"
+        self._lock = asyncio.Lock()
+        self._connection: _HttpConnection | None = None
+        # Cleared once the device is seen closing a connection after a reply
+        self.keep_alive = True
+        self.connections_opened = 0
+
+    async def async_request(
+        self, method: str, path: str, params: dict | None = None
+    ) -> tuple[int, bytes]:
+        """Send a request and return the status and body."""
+        target = f"{path}?{urlencode(params)}" if params else path
+        data = (
+            f"{method.upper()} {target} HTTP/1.1\r\n"
+            f"Host: {self._host}\r\n"
+            f"Connection: {'keep-alive' if self.keep_alive else 'close'}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+
+        async with self._lock:
+            reused = self._connection is not None and not self._connection.closed
+            try:
+                return await self._async_send(data)
+            except ConnectionError:
+                if not reused:
+                    raise
+            # The device dropped the idle connection; retry on a fresh one
+            return await self._async_send(data)
+
+    async def _async_send(self, data: bytes) -> tuple[int, bytes]:
+        """Send on the open connection, or a new one, and read the reply."""
+        connection = self._connection
+        if connection is None or connection.closed:
+            _, connection = await asyncio.get_running_loop().create_connection(
+                _HttpConnection, *self._address
+            )
+            self.connections_opened += 1
+            self._connection = connection
+        try:
+            status, body, keep_alive = await connection.request(data)
+        except BaseException:
+            # Cancelled or failed mid-response, the connection is unusable
+            self._drop(connection)
+            raise
+        if not keep_alive:
+            # The firmware closes after every reply: stop asking to keep alive
+            self.keep_alive = False
+            self._drop(connection)
+        return status, body
+
+    def _drop(self, connection: _HttpConnection) -> None:
+        """Close a connection and forget it."""
+        connection.close()
+        if self._connection is connection:
+            self._connection = None
+
+    def close(self) -> None:
+        """Close the open connection, if any."""
+        if self._connection is not None:
+            self._drop(self._connection)
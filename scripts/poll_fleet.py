@@ -0,0 +1,215 @@
+"""
+Poll Daikin units outside Home Assistant and stream NDJSON records.
+
+Every --interval seconds all hosts are polled concurrently through one
+pooled aiohttp session, and one JSON line per device is written to stdout
+or --output as soon as it is polled. Records pass through a bounded queue:
+when the output cannot keep up, polls wait for room instead of piling up.
+
+Runs without Home Assistant installed; only aiohttp is needed.
+
+Usage: python scripts/poll_fleet.py 192.168.1.20 192.168.1.21 --interval 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import sys
+import time
+import types
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+PACKAGE = "daikin_humidifier"
+PACKAGE_DIR = Path(__file__).resolve().parents[1] / "custom_components" / PACKAGE
+
+# Lines written to the output in one go at most
+WRITE_BATCH = 512
+
+
+def load_library() -> types.ModuleType:
+    """
+    Import the integration's HA-free modules without running its __init__.
+
+    The package __init__ sets up the Home Assistant integration; registering
+    an empty package with the same path lets its submodules be imported on
+    their own.
+    """
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules[PACKAGE] = package
+    importlib.import_module(f"{PACKAGE}.data")
+    return importlib.import_module(f"{PACKAGE}.api")
+
+
+api = load_library()
+data = sys.modules[f"{PACKAGE}.data"]
+scheduler = sys.modules[f"{PACKAGE}.scheduler"]
+
+
+async def async_poll_device(client: Any) -> dict[str, Any]:
+    """Poll one device and return its NDJSON record."""
+    start = time.monotonic()
+    record: dict[str, Any] = {"ts": round(time.time(), 3), "host": client.host}
+    try:
+        control, sensors, status = await asyncio.gather(
+            client.async_get_control_info(),
+            client.async_get_sensor_info(),
+            client.async_get_unit_status(),
+        )
+    except api.DaikinApiClientError as exception:
+        record["ok"] = False
+        record["error"] = str(exception)
+    else:
+        state = data.DaikinDeviceState.from_blocks(control, sensors, status)
+        record["ok"] = True
+        record.update({key: getattr(state, key) for key in data.STATE_KEYS})
+    record["latency_ms"] = round((time.monotonic() - start) * 1000, 1)
+    return record
+
+
+async def async_write_records(
+    queue: asyncio.Queue[dict[str, Any] | None], output: TextIO
+) -> None:
+    """Write queued records until None is queued, a batch at a time."""
+    while True:
+        lines = []
+        record = await queue.get()
+        while record is not None:
+            lines.append(json.dumps(record, separators=(",", ":")))
+            if len(lines) >= WRITE_BATCH or queue.empty():
+                break
+            record = queue.get_nowait()
+        if lines:
+            text = "\n".join(lines) + "\n"
+            # Blocking writes run in a thread so polling goes on meanwhile
+            await asyncio.to_thread(_write, output, text)
+        if record is None:
+            return
+
+
+def _write(output: TextIO, text: str) -> None:
+    """Write and flush, so consumers see records as they come."""
+    output.write(text)
+    output.flush()
+
+
+async def async_poll_fleet(  # noqa: PLR0913
+    hosts: Iterable[str],
+    output: TextIO,
+    *,
+    interval: float,
+    cycles: int,
+    concurrency: int,
+    queue_size: int,
+    transport: str = "aiohttp",
+) -> None:
+    """Poll every host each interval and stream the records to output."""
+    queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(queue_size)
+    writer = asyncio.create_task(async_write_records(queue, output))
+    limiter = scheduler.DaikinRequestScheduler(concurrency)
+
+    async def _async_poll(client: Any) -> None:
+        # Waits here whenever the output falls behind
+        await queue.put(await async_poll_device(client))
+
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=2)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        clients = [
+            api.DaikinApiClient(
+                host=host, session=session, limiter=limiter, transport=transport
+            )
+            for host in hosts
+        ]
+        cycle = 0
+        start = time.monotonic()
+        while not cycles or cycle < cycles:
+            await asyncio.gather(*(_async_poll(client) for client in clients))
+            cycle += 1
+            if cycles and cycle >= cycles:
+                break
+            # Fixed rate; a cycle that overran its interval is followed at once
+            start = max(start + interval, time.monotonic())
+            await asyncio.sleep(start - time.monotonic())
+        for client in clients:
+            client.close()
+
+    await queue.put(None)
+    await writer
+
+
+def read_hosts(arguments: argparse.Namespace) -> list[str]:
+    """Return the hosts given on the command line and in --hosts-file."""
+    hosts = list(arguments.hosts)
+    if arguments.hosts_file:
+        text = Path(arguments.hosts_file).read_text(encoding="utf-8")
+        hosts.extend(
+            line.strip()
+            for line in text.splitlines()
+            if line.strip() and not line.startswith("#")
+        )
+    return list(dict.fromkeys(hosts))
+
+
+def main() -> None:
+    """Parse the arguments and poll until interrupted or --count is reached."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("hosts", nargs="*", help="Addresses (host or host:port)")
+    parser.add_argument("--hosts-file", help="File with one address per line")
+    parser.add_argument("--interval", type=float, default=30.0)
+    parser.add_argument(
+        "--count", type=int, default=0, help="Cycles to run, 0 for no limit"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=64, help="Requests in flight at most"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=1024,
+        help="Records buffered before polls wait for the output",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=("aiohttp", "raw"),
+        default="aiohttp",
+        help="HTTP client; raw keeps a connection to each device open",
+    )
+    parser.add_argument("--output", help="File to append to instead of stdout")
+    arguments = parser.parse_args()
+
+    if not (hosts := read_hosts(arguments)):
+        parser.error("no hosts given")
+
+    with contextlib.ExitStack() as stack:
+        output = (
+            stack.enter_context(Path(arguments.output).open("a", encoding="utf-8"))
+            if arguments.output
+            else sys.stdout
+        )
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(
+                async_poll_fleet(
+                    hosts,
+                    output,
+                    interval=arguments.interval,
+                    cycles=arguments.count,
+                    concurrency=arguments.concurrency,
+                    queue_size=arguments.queue_size,
+                    transport=arguments.transport,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
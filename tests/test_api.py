@@ -0,0 +1,87 @@
+"""Tests for the API client."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.daikin_humidifier.api import DaikinApiClient
+from custom_components.daikin_humidifier.const import (
+    ENDPOINT_SENSOR_INFO,
+    ENDPOINT_SET_CONTROL,
+)
+from custom_components.daikin_humidifier.recording import (
+    ReplayTransport,
+    TrafficRecord,
+)
+from custom_components.daikin_humidifier.scheduler import DaikinRequestScheduler
+
+
+class _LoggingTransport(ReplayTransport):
+    """Replay transport noting the requests sent to its unit, in order."""
+
+    def __init__(self, host: str, log: list[str], poll_duration: float) -> None:
+        """Answer sensor polls after poll_duration and writes at once."""
+        super().__init__(
+            [
+                TrafficRecord(
+                    time=0,
+                    host=host,
+                    method="get",
+                    endpoint=endpoint,
+                    params=None,
+                    duration=duration,
+                    status=200,
+                    body=b"ret=OK",
+                )
+                for endpoint, duration in (
+                    (ENDPOINT_SENSOR_INFO, poll_duration),
+                    (ENDPOINT_SET_CONTROL, 0),
+                )
+            ]
+        )
+        self._host = host
+        self._log = log
+
+    async def async_request(
+        self, method: str, path: str, params: dict | None = None
+    ) -> tuple[int, bytes]:
+        """Note the request, then answer it."""
+        self._log.append(f"{self._host} {path.rpartition('/')[2]}")
+        return await super().async_request(method, path, params)
+
+
+def _client(
+    host: str, limiter: DaikinRequestScheduler, log: list[str], poll_duration: float
+) -> DaikinApiClient:
+    """Return a client of a replayed unit, sharing the fleet limiter."""
+    client = DaikinApiClient(host=host, session=None, limiter=limiter)
+    client.set_replay(_LoggingTransport(host, log, poll_duration))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_fleet_limiter_sends_writes_first() -> None:
+    """A write waits only for the request in flight, not other units' polls."""
+    limiter = DaikinRequestScheduler(max_in_flight=1)
+    log: list[str] = []
+    busy, first, second, writer = (
+        _client(host, limiter, log, poll_duration)
+        for host, poll_duration in (("busy", 0.5), ("a", 0), ("b", 0), ("w", 0))
+    )
+
+    polls = [
+        asyncio.create_task(client.async_get_sensor_info())
+        for client in (busy, first, second)
+    ]
+    await asyncio.sleep(0)
+    write = asyncio.create_task(writer.async_write_control({"pow": "1"}))
+    await asyncio.gather(*polls, write)
+
+    assert log == [
+        "busy get_sensor_info",
+        "w set_control_info",
+        "a get_sensor_info",
+        "b get_sensor_info",
+    ]
@@ -0,0 +1,116 @@
+"""Tests for the per-host circuit breaker."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.daikin_humidifier import api
+from custom_components.daikin_humidifier.api import BreakerState, DaikinCircuitBreaker
+from custom_components.daikin_humidifier.const import (
+    BREAKER_BACKOFF,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_BACKOFF,
+)
+
+
+class _Clock:
+    """Monotonic clock moved by hand."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    """Replace the breaker's monotonic clock."""
+    clock = _Clock()
+    monkeypatch.setattr(api, "monotonic", clock)
+    return clock
+
+
+def _fail_rounds(breaker: DaikinCircuitBreaker, clock: _Clock, rounds: int) -> None:
+    """Fail one request in each of a number of rounds, a second apart."""
+    for _ in range(rounds):
+        sent_at = clock.now
+        clock.now += 1
+        breaker.record_failure(sent_at)
+
+
+def test_opens_after_failed_rounds(clock: _Clock) -> None:
+    """The breaker opens after the threshold of failed rounds."""
+    breaker = DaikinCircuitBreaker()
+    _fail_rounds(breaker, clock, BREAKER_FAILURE_THRESHOLD - 1)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.allow_request()
+
+    _fail_rounds(breaker, clock, 1)
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.retry_in == BREAKER_BACKOFF
+
+
+def test_requests_of_one_round_count_once(clock: _Clock) -> None:
+    """Requests sent before a counted failure do not count again."""
+    breaker = DaikinCircuitBreaker()
+    sent_at = clock.now
+    clock.now += 1
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        breaker.record_failure(sent_at)
+    assert breaker.failures == 1
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_success_resets_failures(clock: _Clock) -> None:
+    """An answer starts the failure count over."""
+    breaker = DaikinCircuitBreaker()
+    _fail_rounds(breaker, clock, BREAKER_FAILURE_THRESHOLD - 1)
+    breaker.record_success()
+    _fail_rounds(breaker, clock, BREAKER_FAILURE_THRESHOLD - 1)
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_probe_after_backoff(clock: _Clock) -> None:
+    """Once the backoff has passed a single probe is let through."""
+    breaker = DaikinCircuitBreaker()
+    _fail_rounds(breaker, clock, BREAKER_FAILURE_THRESHOLD)
+    clock.now += BREAKER_BACKOFF
+    assert breaker.allow_request()
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.failures == 0
+
+
+def test_failed_probe_doubles_backoff(clock: _Clock) -> None:
+    """A failed probe opens the breaker again, for up to the maximum backoff."""
+    breaker = DaikinCircuitBreaker()
+    _fail_rounds(breaker, clock, BREAKER_FAILURE_THRESHOLD)
+    backoff = BREAKER_BACKOFF
+    while backoff < BREAKER_MAX_BACKOFF:
+        clock.now += breaker.retry_in
+        assert breaker.allow_request()
+        # Sent before the last counted failure, but a probe always counts
+        breaker.record_failure(clock.now - backoff)
+        backoff = min(backoff * 2, BREAKER_MAX_BACKOFF)
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.backoff == backoff
+        assert breaker.retry_in == backoff
+
+
+def test_released_probe_lets_next_request_probe(clock: _Clock) -> None:
+    """A probe that ended undecided lets the next request probe at once."""
+    breaker = DaikinCircuitBreaker()
+    _fail_rounds(breaker, clock, BREAKER_FAILURE_THRESHOLD)
+    clock.now += BREAKER_BACKOFF
+    assert breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.backoff == BREAKER_BACKOFF
+    assert breaker.allow_request()
+    assert breaker.state is BreakerState.HALF_OPEN
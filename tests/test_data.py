@@ -0,0 +1,92 @@
+"""Tests for the decoded device state and the sensor report policies."""
+
+from __future__ import annotations
+
+from custom_components.daikin_humidifier.data import DaikinDeviceState, ReportPolicy
+
+CONTROL = {"pow": "1", "mode": "1", "humd": "2", "airvol": "3"}
+SENSORS = {"pm25": "12", "hhum": "45", "htemp": "21.5"}
+STATUS = {"filter_sign": "0"}
+
+
+def _state(
+    control: dict[str, str] | None = None,
+    sensors: dict[str, str] | None = None,
+    stale: frozenset[str] = frozenset(),
+) -> DaikinDeviceState:
+    """Return a state decoded from the given blocks, the defaults otherwise."""
+    return DaikinDeviceState.from_blocks(
+        control or CONTROL, sensors or SENSORS, STATUS, stale
+    )
+
+
+def test_unchanged_state_has_no_changed_keys() -> None:
+    """Equal blocks decode to states with nothing changed."""
+    assert not _state().changed_keys(_state())
+
+
+def test_changed_keys_are_the_changed_fields() -> None:
+    """Only the decoded fields that differ are changed."""
+    state = _state(sensors={**SENSORS, "pm25": "15", "htemp": "22.0"})
+    assert state.changed_keys(_state()) == {"pm25", "htemp"}
+
+
+def test_raw_only_change_is_not_a_change() -> None:
+    """A change of a raw value that no field decodes is not reported."""
+    state = _state(control={**CONTROL, "unknown": "1"})
+    assert not state.changed_keys(_state())
+
+
+def test_stale_block_changes_its_fields() -> None:
+    """A block going stale or fresh changes all its fields, same values or not."""
+    stale = _state(stale=frozenset({"sensors"}))
+    assert stale.changed_keys(_state()) == {"pm25", "hhum", "htemp"}
+    assert _state().changed_keys(stale) == {"pm25", "hhum", "htemp"}
+
+
+def test_with_control_merges_params() -> None:
+    """Merged control parameters change only their fields."""
+    state = _state(stale=frozenset({"status"}))
+    merged = state.with_control({"pow": "0"})
+    assert merged.power is False
+    assert merged.stale == state.stale
+    assert merged.changed_keys(state) == {"power"}
+
+
+def test_any_change_is_significant_without_deadbands() -> None:
+    """With both deadbands 0 every change is significant."""
+    policy = ReportPolicy()
+    assert policy.significant(20.0, 20.1)
+    assert not policy.significant(20.0, 20.0)
+
+
+def test_absolute_deadband() -> None:
+    """A reading within the absolute deadband is not significant."""
+    policy = ReportPolicy(absolute=2)
+    assert not policy.significant(10, 12)
+    assert policy.significant(10, 12.5)
+    assert policy.significant(10, 7)
+
+
+def test_relative_deadband() -> None:
+    """The relative deadband is a fraction of the written reading."""
+    policy = ReportPolicy(relative=0.1)
+    assert not policy.significant(50, 55)
+    assert policy.significant(50, 56)
+    assert policy.significant(-50, -56)
+
+
+def test_either_deadband_is_enough() -> None:
+    """A change beyond either deadband is significant."""
+    policy = ReportPolicy(absolute=5, relative=0.1)
+    assert policy.significant(10, 16)
+    assert policy.significant(100, 111)
+    assert not policy.significant(100, 104)
+
+
+def test_missing_reading_is_significant() -> None:
+    """A reading appearing or disappearing is always significant."""
+    policy = ReportPolicy(absolute=100)
+    assert policy.significant(None, 10)
+    assert policy.significant(10, None)
+    assert not policy.significant(None, None)
@@ -0,0 +1,97 @@
+"""Tests for the in-memory sensor history and the hourly aggregate."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.daikin_humidifier.history import HourlyAggregate, SampleHistory
+
+HOUR = 3600.0
+WINDOW = 60.0
+
+
+def _history(capacity: int = 100) -> SampleHistory:
+    """Return an empty history of pm25 and hhum over a one-minute window."""
+    return SampleHistory(keys=("pm25", "hhum"), windows=(WINDOW,), capacity=capacity)
+
+
+def test_empty_history() -> None:
+    """Without samples there are no statistics."""
+    history = _history()
+    assert len(history) == 0
+    assert history.mean("pm25", WINDOW) is None
+    assert history.minimum("pm25", WINDOW) is None
+    assert history.maximum("pm25", WINDOW) is None
+    assert history.slope("pm25", WINDOW) is None
+
+
+def test_window_statistics() -> None:
+    """Mean, minimum, maximum and trend cover the samples in the window."""
+    history = _history()
+    for t, value in ((0, 10), (10, 30), (20, 20)):
+        history.add(1000 + t, {"pm25": value})
+    assert history.mean("pm25", WINDOW) == 20
+    assert history.minimum("pm25", WINDOW) == 10
+    assert history.maximum("pm25", WINDOW) == 30
+    assert history.slope("pm25", WINDOW) == pytest.approx(0.5)
+
+
+def test_samples_leave_the_window() -> None:
+    """Samples older than the window no longer count."""
+    history = _history()
+    history.add(0, {"pm25": 50})
+    history.add(30, {"pm25": 10})
+    history.add(70, {"pm25": 20})
+    assert history.mean("pm25", WINDOW) == 15
+    assert history.maximum("pm25", WINDOW) == 20
+    assert len(history) == 3
+
+
+def test_overwritten_samples_leave_the_window() -> None:
+    """A sample overwritten in a full buffer leaves the window."""
+    history = _history(capacity=2)
+    for t, value in ((0, 5), (1, 1), (2, 3)):
+        history.add(t, {"pm25": value})
+    assert len(history) == 2
+    assert history.minimum("pm25", WINDOW) == 1
+    assert history.maximum("pm25", WINDOW) == 3
+    assert history.mean("pm25", WINDOW) == 2
+
+
+def test_missing_values_are_skipped() -> None:
+    """A key missing from a sample is left out of its statistics."""
+    history = _history()
+    history.add(0, {"pm25": 10, "hhum": 40})
+    history.add(10, {"pm25": 20, "hhum": None})
+    assert history.mean("hhum", WINDOW) == 40
+    assert history.slope("hhum", WINDOW) is None
+    assert history.mean("pm25", WINDOW) == 15
+
+
+def test_hour_closed_by_next_hour() -> None:
+    """The first sample of a later hour returns the hour before it."""
+    hourly = HourlyAggregate()
+    assert hourly.add(HOUR + 10, {"pm25": 10, "hhum": None}) is None
+    assert hourly.add(HOUR + 20, {"pm25": 20}) is None
+    assert hourly.add(2 * HOUR, {"pm25": 30}) == (HOUR, {"pm25": (15, 10, 20)})
+    assert hourly.close() == (2 * HOUR, {"pm25": (30, 30, 30)})
+    assert hourly.close() is None
+
+
+def test_current_keeps_hour_open() -> None:
+    """The hour so far can be read and then added to."""
+    hourly = HourlyAggregate()
+    hourly.add(HOUR, {"pm25": 10})
+    assert hourly.current() == (HOUR, {"pm25": (10, 10, 10)})
+    hourly.add(HOUR + 60, {"pm25": 20})
+    assert hourly.current() == (HOUR, {"pm25": (15, 10, 20)})
+
+
+def test_restore_reopens_hour() -> None:
+    """An hour saved with as_dict goes on with its samples."""
+    saved = HourlyAggregate()
+    saved.add(HOUR, {"htemp": 20})
+    hourly = HourlyAggregate()
+    hourly.restore(saved.as_dict())
+    hourly.add(HOUR + 60, {"htemp": 22})
+    assert hourly.close() == (HOUR, {"htemp": (21, 20, 22)})
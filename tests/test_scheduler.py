@@ -0,0 +1,242 @@
+"""Tests for the per-device request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.daikin_humidifier.scheduler import (
+    DaikinRequestScheduler,
+    RequestPriority,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+class _Device:
+    """Fake device recording the requests it was sent, in order."""
+
+    def __init__(self) -> None:
+        """Start with an open gate, so requests answer at once."""
+        self.sent: list[str] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    def send(self, name: str) -> Callable[[], Awaitable[str]]:
+        """Return a coroutine function sending the named request."""
+
+        async def _send() -> str:
+            self.sent.append(name)
+            await self.gate.wait()
+            return f"{name} answer"
+
+        return _send
+
+
+async def _submit_blocking(
+    scheduler: DaikinRequestScheduler, device: _Device
+) -> asyncio.Task[str]:
+    """Send a request that holds the only slot until the gate opens."""
+    device.gate.clear()
+    task = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, None, device.send("busy"))
+    )
+    await asyncio.sleep(0)
+    assert device.sent == ["busy"]
+    return task
+
+
+@pytest.mark.asyncio
+async def test_write_sent_before_queued_polls() -> None:
+    """A write queued after polls is sent before them."""
+    scheduler = DaikinRequestScheduler(max_in_flight=1)
+    device = _Device()
+    busy = await _submit_blocking(scheduler, device)
+
+    poll = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", device.send("poll"))
+    )
+    control = asyncio.create_task(
+        scheduler.async_submit(
+            RequestPriority.CONTROL, "control", device.send("control")
+        )
+    )
+    write = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.WRITE, None, device.send("write"))
+    )
+    await asyncio.sleep(0)
+    assert scheduler.queued == 3
+
+    device.gate.set()
+    await asyncio.gather(busy, poll, control, write)
+    assert device.sent == ["busy", "write", "control", "poll"]
+
+
+@pytest.mark.asyncio
+async def test_same_priority_is_first_in_first_out() -> None:
+    """Requests of one priority are sent in the order they were submitted."""
+    scheduler = DaikinRequestScheduler(max_in_flight=1)
+    device = _Device()
+    busy = await _submit_blocking(scheduler, device)
+
+    writes = [
+        asyncio.create_task(
+            scheduler.async_submit(RequestPriority.WRITE, None, device.send(name))
+        )
+        for name in ("first", "second", "third")
+    ]
+    await asyncio.sleep(0)
+    device.gate.set()
+    await asyncio.gather(busy, *writes)
+    assert device.sent == ["busy", "first", "second", "third"]
+
+
+@pytest.mark.asyncio
+async def test_queued_reads_are_shared() -> None:
+    """A read matching a queued one gets its result instead of being sent."""
+    scheduler = DaikinRequestScheduler(max_in_flight=1)
+    device = _Device()
+    busy = await _submit_blocking(scheduler, device)
+
+    first = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", device.send("first"))
+    )
+    await asyncio.sleep(0)
+    second = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", device.send("second"))
+    )
+    await asyncio.sleep(0)
+
+    device.gate.set()
+    await busy
+    assert await asyncio.gather(first, second) == ["first answer", "first answer"]
+    assert device.sent == ["busy", "first"]
+    assert scheduler.shared == 1
+
+
+@pytest.mark.asyncio
+async def test_sent_reads_are_not_shared() -> None:
+    """A read submitted after a matching one was sent is sent again."""
+    scheduler = DaikinRequestScheduler(max_in_flight=1)
+    device = _Device()
+    device.gate.clear()
+
+    first = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", device.send("first"))
+    )
+    await asyncio.sleep(0)
+    second = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", device.send("second"))
+    )
+    await asyncio.sleep(0)
+
+    device.gate.set()
+    assert await asyncio.gather(first, second) == ["first answer", "second answer"]
+    assert scheduler.shared == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_owner_lets_sharer_send() -> None:
+    """Cancelling a queued read does not fail the callers sharing it."""
+    scheduler = DaikinRequestScheduler(max_in_flight=1)
+    device = _Device()
+    busy = await _submit_blocking(scheduler, device)
+
+    owner = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", device.send("owner"))
+    )
+    await asyncio.sleep(0)
+    sharer = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", device.send("sharer"))
+    )
+    await asyncio.sleep(0)
+
+    owner.cancel()
+    device.gate.set()
+    await busy
+    assert await sharer == "sharer answer"
+    assert owner.cancelled()
+    assert device.sent == ["busy", "sharer"]
+    assert scheduler.shared == 0
+    assert scheduler.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_sent_owner_lets_sharer_send() -> None:
+    """Cancelling a read while it is sent makes its sharers send their own."""
+    scheduler = DaikinRequestScheduler(max_in_flight=1)
+    device = _Device()
+    busy = await _submit_blocking(scheduler, device)
+    owner_sent = asyncio.Event()
+
+    async def _hang() -> str:
+        owner_sent.set()
+        await asyncio.Event().wait()
+        return "never"
+
+    owner = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", _hang)
+    )
+    await asyncio.sleep(0)
+    sharer = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", device.send("sharer"))
+    )
+    await asyncio.sleep(0)
+
+    device.gate.set()
+    await busy
+    await owner_sent.wait()
+    owner.cancel()
+    assert await sharer == "sharer answer"
+    assert owner.cancelled()
+    assert device.sent == ["busy", "sharer"]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared() -> None:
+    """Callers sharing a read that fails get its error."""
+    scheduler = DaikinRequestScheduler(max_in_flight=1)
+    device = _Device()
+    busy = await _submit_blocking(scheduler, device)
+
+    async def _fail() -> str:
+        raise ConnectionError
+
+    owner = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", _fail)
+    )
+    await asyncio.sleep(0)
+    sharer = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, "sensors", device.send("sharer"))
+    )
+    await asyncio.sleep(0)
+
+    device.gate.set()
+    await busy
+    for task in (owner, sharer):
+        with pytest.raises(ConnectionError):
+            await task
+    assert device.sent == ["busy"]
+
+
+@pytest.mark.asyncio
+async def test_raising_max_in_flight_sends_queued() -> None:
+    """Requests waiting for a slot are sent once max_in_flight grows."""
+    scheduler = DaikinRequestScheduler(max_in_flight=1)
+    device = _Device()
+    busy = await _submit_blocking(scheduler, device)
+
+    poll = asyncio.create_task(
+        scheduler.async_submit(RequestPriority.POLL, None, device.send("poll"))
+    )
+    await asyncio.sleep(0)
+    assert device.sent == ["busy"]
+
+    scheduler.max_in_flight = 2
+    await asyncio.sleep(0)
+    assert device.sent == ["busy", "poll"]
+    device.gate.set()
+    await asyncio.gather(busy, poll)
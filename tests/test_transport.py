@@ -0,0 +1,249 @@
+"""Tests for the lightweight HTTP transport."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.daikin_humidifier.transport import ProtocolError, RawTransport
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+BODY = b"ret=OK,pow=1,mode=1,airvol=3,humd=2"
+
+
+def _response(*headers: str, body: bytes = BODY, version: str = "HTTP/1.1") -> bytes:
+    """Return a 200 response with the given header lines and body."""
+    head = "\r\n".join((f"{version} 200 OK", *headers)) + "\r\n\r\n"
+    return head.encode("latin-1") + body
+
+
+def _chunked(body: bytes, size: int) -> bytes:
+    """Return a body in chunked encoding, in chunks of at most size bytes."""
+    chunks = [body[start : start + size] for start in range(0, len(body), size)]
+    return (
+        b"".join(b"%x\r\n%b\r\n" % (len(chunk), chunk) for chunk in chunks)
+        + b"0\r\n\r\n"
+    )
+
+
+class _Device:
+    """Local server answering each request with the next canned response."""
+
+    def __init__(self, responses: list[bytes], *, close: bool = False) -> None:
+        """
+        Initialize the device.
+
+        Args:
+            responses: Raw responses, sent in order and then from the start
+            close: Whether to close the connection after every response
+
+        """
+        self.responses = responses
+        self.close = close
+        self.requests: list[bytes] = []
+        self.connections = 0
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the requests of one connection."""
+        self.connections += 1
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                response = self.responses[len(self.requests) % len(self.responses)]
+                self.requests.append(head)
+                # Sent in two parts, so responses arrive split
+                writer.write(response[:20])
+                await writer.drain()
+                await asyncio.sleep(0)
+                writer.write(response[20:])
+                await writer.drain()
+                if self.close:
+                    break
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+
+@asynccontextmanager
+async def _serve(device: _Device) -> AsyncIterator[RawTransport]:
+    """Serve the device locally and yield a transport connected to it."""
+    server = await asyncio.start_server(device.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    transport = RawTransport(f"127.0.0.1:{port}")
+    try:
+        yield transport
+    finally:
+        transport.close()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_content_length_body() -> None:
+    """A body delimited by Content-Length is read on a kept-alive connection."""
+    device = _Device([_response(f"Content-Length: {len(BODY)}")])
+    async with _serve(device) as transport:
+        for _ in range(3):
+            assert await transport.async_request(
+                "get", "/cleaner/get_control_info"
+            ) == (200, BODY)
+    assert device.connections == 1
+    assert transport.keep_alive
+
+
+@pytest.mark.asyncio
+async def test_content_length_ignores_extra_bytes() -> None:
+    """Bytes past Content-Length are not part of the body."""
+    device = _Device([_response("Content-Length: 6", body=b"ret=OKjunk")])
+    async with _serve(device) as transport:
+        assert await transport.async_request("get", "/") == (200, b"ret=OK")
+
+
+@pytest.mark.asyncio
+async def test_chunked_body() -> None:
+    """A chunked body is decoded, whatever the chunk sizes."""
+    device = _Device(
+        [
+            _response("Transfer-Encoding: chunked", body=_chunked(BODY, size))
+            for size in (1, 7, len(BODY))
+        ]
+    )
+    async with _serve(device) as transport:
+        for _ in range(3):
+            assert await transport.async_request("get", "/") == (200, BODY)
+    assert device.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_chunk_extensions_are_ignored() -> None:
+    """Extensions after a chunk size are not part of the size."""
+    body = b"6;name=value\r\nret=OK\r\n0\r\n\r\n"
+    device = _Device([_response("Transfer-Encoding: chunked", body=body)])
+    async with _serve(device) as transport:
+        assert await transport.async_request("get", "/") == (200, b"ret=OK")
+
+
+@pytest.mark.asyncio
+async def test_body_until_end_of_connection() -> None:
+    """A body without length is read until the device closes the connection."""
+    device = _Device([_response(version="HTTP/1.0")], close=True)
+    async with _serve(device) as transport:
+        assert await transport.async_request("get", "/") == (200, BODY)
+        assert not transport.keep_alive
+        assert await transport.async_request("get", "/") == (200, BODY)
+    assert device.connections == 2
+    assert b"Connection: close" in device.requests[1]
+
+
+@pytest.mark.asyncio
+async def test_connection_close_stops_keep_alive() -> None:
+    """A device closing after its reply gets one-shot connections."""
+    device = _Device(
+        [_response(f"Content-Length: {len(BODY)}", "Connection: close")], close=True
+    )
+    async with _serve(device) as transport:
+        for _ in range(2):
+            assert await transport.async_request("get", "/") == (200, BODY)
+        assert not transport.keep_alive
+    assert device.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_query_parameters() -> None:
+    """Parameters are sent in the query string."""
+    device = _Device([_response(f"Content-Length: {len(BODY)}")])
+    async with _serve(device) as transport:
+        await transport.async_request(
+            "get", "/cleaner/set_control_info", {"pow": "1", "humd": "2"}
+        )
+    assert device.requests[0].startswith(
+        b"GET /cleaner/set_control_info?pow=1&humd=2 HTTP/1.1\r\n"
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("length", ["-1", "abc", "1e3", ""])
+async def test_invalid_content_length(length: str) -> None:
+    """A malformed or negative Content-Length fails and drops the connection."""
+    device = _Device(
+        [_response(f"Content-Length: {length}"), _response("Content-Length: 6")]
+    )
+    async with _serve(device) as transport:
+        with pytest.raises(ProtocolError, match="Content-Length"):
+            await asyncio.wait_for(transport.async_request("get", "/"), 5)
+        assert await transport.async_request("get", "/") == (200, b"ret=OK")
+    assert device.connections == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [b"zz\r\nret=OK\r\n0\r\n\r\n", b"-6\r\nret=OK\r\n0\r\n\r\n", b"ff\r\n0\r\n\r\n"],
+)
+async def test_invalid_chunked_body(body: bytes) -> None:
+    """An invalid chunk size fails the request instead of leaving it hanging."""
+    device = _Device([_response("Transfer-Encoding: chunked", body=body)])
+    async with _serve(device) as transport:
+        with pytest.raises(ProtocolError, match="chunked"):
+            await asyncio.wait_for(transport.async_request("get", "/"), 5)
+
+
+@pytest.mark.asyncio
+async def test_invalid_status_line() -> None:
+    """A response that is not HTTP fails the request."""
+    device = _Device([b"SSH-2.0-OpenSSH\r\n\r\n"])
+    async with _serve(device) as transport:
+        with pytest.raises(ProtocolError, match="status line"):
+            await transport.async_request("get", "/")
+
+
+@pytest.mark.asyncio
+async def test_closed_before_response_ended() -> None:
+    """A connection closed mid-body fails the request."""
+    device = _Device([_response("Content-Length: 100")], close=True)
+    async with _serve(device) as transport:
+        with pytest.raises(ConnectionError):
+            await transport.async_request("get", "/")
+
+
+@pytest.mark.parametrize(
+    ("host", "address", "header"),
+    [
+        ("192.168.1.5", ("192.168.1.5", 80), "192.168.1.5"),
+        ("192.168.1.5:8080", ("192.168.1.5", 8080), "192.168.1.5:8080"),
+        ("fe80::1", ("fe80::1", 80), "[fe80::1]"),
+        ("[fe80::1]", ("fe80::1", 80), "[fe80::1]"),
+        ("[::1]:8080", ("::1", 8080), "[::1]:8080"),
+    ],
+)
+def test_host_address(host: str, address: tuple[str, int], header: str) -> None:
+    """IPv6 literals are not split at their last colon."""
+    transport = RawTransport(host)
+    assert transport._address == address  # noqa: SLF001
+    assert transport._host == header  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_ipv6_device() -> None:
+    """A device is reached at a bracketed IPv6 address with a port."""
+    device = _Device([_response(f"Content-Length: {len(BODY)}")])
+    try:
+        server = await asyncio.start_server(device.handle, "::1", 0)
+    except OSError:
+        pytest.skip("IPv6 is not available")
+    port = server.sockets[0].getsockname()[1]
+    transport = RawTransport(f"[::1]:{port}")
+    try:
+        assert await transport.async_request("get", "/") == (200, BODY)
+    finally:
+        transport.close()
+        server.close()
+        await server.wait_closed()
+    assert f"Host: [::1]:{port}\r\n".encode() in device.requests[0]